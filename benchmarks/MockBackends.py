@@ -0,0 +1,306 @@
+import base64
+import io
+import math
+import random
+import threading
+import time
+import wave
+from types import SimpleNamespace
+
+class LatencyDistribution:
+    """
+    Lognormal latency given a median and a p95 (ms), which is roughly how provider latencies look.
+    {"median_ms": 300, "p95_ms": 900}, a plain number means a fixed latency.
+    """
+
+    def __init__(self, spec, rng):
+        if isinstance(spec, (int, float)):
+            spec = {"median_ms": spec, "p95_ms": spec}
+        self.median_ms = spec["median_ms"]
+        p95_ms = spec.get("p95_ms", self.median_ms)
+        self.mu = math.log(max(self.median_ms, 0.001))
+        self.sigma = math.log(max(p95_ms, self.median_ms) / max(self.median_ms, 0.001)) / 1.645  # z-score of p95
+        self.rng = rng
+
+    def sample_ms(self):
+        if self.sigma == 0:
+            return self.median_ms
+        return self.rng.lognormvariate(self.mu, self.sigma)
+
+    def sleep(self):
+        time.sleep(self.sample_ms() / 1000)
+
+
+class MockBackends:
+    """
+    Stand-ins for the provider SDK clients, with latencies from one profile (see
+    benchmarks/profiles/default.json). Only the network boundary is faked: the real
+    LLMManager, STTManager, TTSManager and Translator run on top of these, with their
+    ResilientCaller policies, caches and phrase bank.
+    """
+
+    def __init__(self, profile, seed=None):
+        self.profile = profile
+        self.rng = _LockedRandom(random.Random(seed), threading.Lock())
+
+    def distribution(self, section, key):
+        return LatencyDistribution(self.profile[section][key], self.rng)
+
+    def groq_client(self):
+        """For LLMManager and GroqSTTBackend, in place of groq.Groq"""
+        return FakeGroq(self)
+
+    def google_clients(self):
+        """For GoogleTTSBackend and Translator, in place of GoogleClients"""
+        return FakeGoogleClients(self)
+
+
+class _LockedRandom:
+    """One seeded random.Random shared by every fake, sampled under a lock since the fakes run on many threads."""
+
+    def __init__(self, rng, lock):
+        self.rng = rng
+        self.lock = lock
+
+    def lognormvariate(self, mu, sigma):
+        with self.lock:
+            return self.rng.lognormvariate(mu, sigma)
+
+    def random(self):
+        with self.lock:
+            return self.rng.random()
+
+    def choice(self, options):
+        with self.lock:
+            return self.rng.choice(options)
+
+
+class FakeGroq:
+    """Stands in for groq.Groq: chat completions (streamed or not) and Whisper transcriptions, in the SDK's response shapes."""
+
+    def __init__(self, backends):
+        self.chat = SimpleNamespace(completions=_FakeChatCompletions(backends))
+        self.audio = SimpleNamespace(transcriptions=_FakeTranscriptions(backends))
+        self.models = SimpleNamespace(list=lambda: [])
+
+
+class _FakeChatCompletions:
+    """A canned reply after a sampled time to first token, streamed word by word at a configured token rate."""
+
+    RESPONSES = (
+        "¡Claro que sí! Un café con leche, muy bien. "
+        "¿Lo quieres caliente o frío? "
+        "También tenemos pan dulce recién hecho, las conchas están deliciosas hoy.",
+        "¡Perfecto! El pan dulce cuesta dos dólares. "
+        "¿Quieres algo de tomar con eso? "
+        "El chocolate caliente es muy popular por la mañana.",
+        "¡Muy bien! Tenemos té verde y jugo de naranja sin azúcar. "
+        "¿Cuál prefieres? "
+        "Si quieres, te lo preparo para llevar.",
+    )
+
+    def __init__(self, backends):
+        self.rng = backends.rng
+        self.first_token = backends.distribution("llm", "first_token")
+        self.token_interval_s = 1 / backends.profile["llm"].get("tokens_per_sec", 300)
+
+    @staticmethod
+    def _usage(messages):
+        # ~4 characters per token, the system prompt counts as the cached prefix
+        prompt_tokens = sum(len(message["content"]) for message in messages) // 4
+        cached_tokens = len(messages[0]["content"]) // 4 if messages and messages[0]["role"] == "system" else 0
+        return SimpleNamespace(prompt_tokens=prompt_tokens, prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens))
+
+    def create(self, messages, model, stream=False, **kwargs):
+        response = self.rng.choice(self.RESPONSES)
+        usage = self._usage(messages)
+        if stream:
+            return _FakeChatStream(response, usage, self.first_token, self.token_interval_s)
+        self.first_token.sleep()
+        time.sleep(len(response.split()) * self.token_interval_s)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=response))], usage=usage)
+
+
+class _FakeChatStream:
+    """Iterable of chat completion chunks, usage on the last one under x_groq like Groq's; close() stops it."""
+
+    def __init__(self, response, usage, first_token, token_interval_s):
+        self.response = response
+        self.usage = usage
+        self.first_token = first_token
+        self.token_interval_s = token_interval_s
+        self.closed = False
+
+    def __iter__(self):
+        self.first_token.sleep()
+        for i, word in enumerate(self.response.split(" ")):
+            if self.closed:
+                return
+            if i:
+                time.sleep(self.token_interval_s)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))], x_groq=None)
+        yield SimpleNamespace(choices=[], x_groq=SimpleNamespace(usage=self.usage))
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeTranscriptions:
+    """Whisper's verbose_json result for fixed transcripts after a sampled delay, auto-detect misses at `misdetect_rate`."""
+
+    TRANSCRIPTS = (
+        ("Hola, quiero un café con leche por favor.", "Spanish"),
+        ("¿Cuánto cuesta el pan dulce?", "Spanish"),
+        ("I'd like a medium coffee, please.", "English"),
+        ("¿Tienen algo sin azúcar?", "Spanish"),
+    )
+
+    def __init__(self, backends):
+        self.rng = backends.rng
+        self.latency = backends.distribution("stt", "latency")
+        self.misdetect_rate = backends.profile["stt"].get("misdetect_rate", 0.0)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def create(self, file, model, response_format="json", language=None, **kwargs):
+        self.latency.sleep()
+        with self.lock:
+            self.count += 1
+            text, detected = self.TRANSCRIPTS[self.count % len(self.TRANSCRIPTS)]
+        if language:
+            detected = "Spanish" if language == "es" else "English"
+        elif self.rng.random() < self.misdetect_rate:
+            detected = "Portuguese"  # sends STTManager down its language fallback
+        return SimpleNamespace(text=text, language=detected)
+
+
+class FakeGoogleClients:
+    """Stands in for GoogleClients: the gRPC TTS client, the REST session for whole-sentence synthesis and the Translate client."""
+
+    def __init__(self, backends):
+        audio = _FakeSpeech(backends)
+        self.session = _FakeTTSRestSession(audio)
+        self._tts_client = _FakeTTSGrpcClient(audio)
+        self._translate_client = _FakeTranslateClient(backends)
+
+    def tts_client(self):
+        return self._tts_client
+
+    def translate_client(self):
+        return self._translate_client
+
+    def access_token(self):
+        return "benchmark"
+
+    def refresh(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FakeSpeech:
+    """24kHz 16-bit PCM chunks (low-level noise) for a text, delivered at a configured real-time factor."""
+
+    SAMPLE_RATE = 24000
+    CHARS_PER_SECOND = 14  # rough speaking rate, sets how much audio a sentence produces
+
+    def __init__(self, backends):
+        profile = backends.profile["tts"]
+        self.first_chunk = backends.distribution("tts", "first_chunk")
+        self.chunk_ms = profile.get("chunk_ms", 200)
+        self.realtime_factor = profile.get("realtime_factor", 0.25)  # synthesis time / audio time
+        samples = self.SAMPLE_RATE * self.chunk_ms // 1000
+        rng = random.Random(0)
+        self.chunk = b"".join(rng.randint(-200, 200).to_bytes(2, "little", signed=True) for _ in range(samples))
+
+    def chunk_count(self, text):
+        return max(1, math.ceil(len(text) / self.CHARS_PER_SECOND * 1000 / self.chunk_ms))
+
+    def chunks(self, text, cancelled=lambda: False):
+        self.first_chunk.sleep()
+        for i in range(self.chunk_count(text)):
+            if cancelled():
+                return
+            if i:
+                time.sleep(self.chunk_ms / 1000 * self.realtime_factor)
+            yield self.chunk
+
+
+class _FakeTTSGrpcClient:
+    """TextToSpeechClient: streaming_synthesize reads the text from the request iterator like the real call."""
+
+    def __init__(self, audio):
+        self.audio = audio
+
+    def list_voices(self, language_code=None):
+        return []
+
+    def streaming_synthesize(self, requests, timeout=None):
+        text = "".join(request.input.text for request in requests)
+        return _FakeTTSStream(self.audio, text)
+
+
+class _FakeTTSStream:
+    """Iterable of StreamingSynthesizeResponse-like objects; cancel() ends it, like cancelling the gRPC call."""
+
+    def __init__(self, audio, text):
+        self.audio = audio
+        self.text = text
+        self.cancelled = False
+
+    def __iter__(self):
+        for chunk in self.audio.chunks(self.text, cancelled=lambda: self.cancelled):
+            yield SimpleNamespace(audio_content=chunk)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _FakeTTSRestSession:
+    """The pooled requests.Session as GoogleTTSBackend.synthesize_wav uses it: a text:synthesize POST returning base64 WAV."""
+
+    def __init__(self, audio):
+        self.audio = audio
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        pcm = b"".join(self.audio.chunks(json["input"]["markup"]))
+        output = io.BytesIO()
+        with wave.open(output, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.audio.SAMPLE_RATE)
+            wav_file.writeframes(pcm)
+        return _FakeResponse({"audioContent": base64.b64encode(output.getvalue()).decode()})
+
+    def close(self):
+        pass
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeTranslateClient:
+    """translate_v2.Client: tags the text after a sampled delay, one dict per value like the real client."""
+
+    def __init__(self, backends):
+        self.latency = backends.distribution("translation", "latency")
+
+    def get_languages(self):
+        return []
+
+    def translate(self, values, target_language=None, source_language=None, format_=None, **kwargs):
+        self.latency.sleep()
+        if isinstance(values, str):
+            return {"translatedText": f"[{target_language}] {values}", "input": values}
+        return [{"translatedText": f"[{target_language}] {value}", "input": value} for value in values]
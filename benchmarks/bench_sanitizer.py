@@ -0,0 +1,150 @@
+"""
+Micro-benchmark: TextSanitizer against the regex-based clean_text it replaced.
+
+    python -m benchmarks.bench_sanitizer --repeat 200 --rounds 7
+
+Checks both produce identical output first (whole text and streamed token by token),
+then times whole-text cleaning, streaming, and what SentencePipeline does per turn
+(old: clean every sentence, then the joined response again; new: clean tokens as they arrive).
+Each case keeps its best of `--rounds` runs, and is compared with the legacy code doing the same job.
+"""
+import argparse
+import random
+import re
+import timeit
+
+from src.core.SentencePipeline import SentenceChunker
+from src.core.TextSanitizer import TextSanitizer
+
+
+class LegacyCleanText:
+    """The previous Utils.clean_text: emoji regex, format regex, then two whitespace passes."""
+
+    EMOJI_PATTERN = re.compile(
+        "["
+        "\U0001F1E0-\U0001F1FF"
+        "\U0001F300-\U0001F5FF"
+        "\U0001F600-\U0001F64F"
+        "\U0001F680-\U0001F6FF"
+        "\U0001F700-\U0001F77F"
+        "\U0001F780-\U0001F7FF"
+        "\U0001F800-\U0001F8FF"
+        "\U0001F900-\U0001F9FF"
+        "\U0001FA00-\U0001FA6F"
+        "\U0001FA70-\U0001FAFF"
+        "\U00002702-\U000027B0"
+        "\U000024C2-\U0001F251"
+        "\U00002500-\U00002BEF"
+        "\U0001F926-\U0001F937"
+        "\U00010000-\U0010FFFF"
+        "\u2640-\u2642"
+        "\u2600-\u2B55"
+        "\u200D"
+        "\u23CF\u23E9\u231A"
+        "\ufe0f\u3030"
+        "]+",
+        flags=re.UNICODE
+    )
+    FORMAT_PATTERN = re.compile(r'[\\*_~`\[\]]')
+
+    @classmethod
+    def clean(cls, text):
+        no_emoji = cls.EMOJI_PATTERN.sub('', text)
+        clean = cls.FORMAT_PATTERN.sub('', no_emoji)
+        clean = re.sub(r'[ \t]+', ' ', clean)
+        clean = re.sub(r'\n+', '\n', clean)
+        return clean.strip()
+
+
+WORDS = ("Claro", "que", "sí", "**muy**", "bien", "café", "con", "leche", "¿Lo", "quieres", "caliente?", "_frío_",
+         "¡Perfecto!", "😊", "👍🏽", "`pan`", "dulce", "[nota]", "también", "tenemos", "conchas.", "\n", "\n\n", "\t")
+
+
+def synthetic_response(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def tokens_of(text, rng):
+    """Split like an LLM stream: short irregular deltas"""
+    tokens, i = [], 0
+    while i < len(text):
+        step = rng.randint(1, 6)
+        tokens.append(text[i:i + step])
+        i += step
+    return tokens
+
+
+def stream_legacy(tokens):
+    # the old code could not clean a stream incrementally, it re-cleaned the joined text at the end
+    return LegacyCleanText.clean("".join(tokens))
+
+
+def stream_sanitizer(tokens):
+    sanitizer = TextSanitizer()
+    return "".join(sanitizer.feed(token) for token in tokens) + sanitizer.flush()
+
+
+def pipeline_legacy(tokens):
+    chunker = SentenceChunker()
+    sentences = []
+    for token in tokens:
+        sentences.extend(LegacyCleanText.clean(sentence) for sentence in chunker.feed(token))
+    sentences.extend(LegacyCleanText.clean(sentence) for sentence in chunker.flush())
+    return LegacyCleanText.clean("".join(tokens))
+
+
+def pipeline_sanitizer(tokens):
+    sanitizer = TextSanitizer()
+    chunker = SentenceChunker()
+    sentences, parts = [], []
+    for token in tokens:
+        clean = sanitizer.feed(token)
+        if clean:
+            parts.append(clean)
+            sentences.extend(chunker.feed(clean))
+    sentences.extend(chunker.flush())
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare TextSanitizer with the legacy regex clean_text.")
+    parser.add_argument("--words", type=int, default=2000, help="words per synthetic response")
+    parser.add_argument("--responses", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50, help="calls per timed run")
+    parser.add_argument("--rounds", type=int, default=5, help="timed runs per case, the fastest one counts")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    responses = [synthetic_response(rng, args.words) for _ in range(args.responses)]
+    streams = [tokens_of(text, rng) for text in responses]
+
+    for text, tokens in zip(responses, streams):
+        expected = LegacyCleanText.clean(text)
+        assert TextSanitizer.clean(text) == expected, "whole-text output differs from the legacy clean_text"
+        assert stream_sanitizer(tokens) == expected, "streamed output differs from the legacy clean_text"
+        assert pipeline_sanitizer(tokens) == pipeline_legacy(tokens), "pipeline response differs"
+
+    def best(run):
+        # the fastest run is the one least disturbed by the rest of the machine
+        return min(timeit.repeat(run, number=args.repeat, repeat=args.rounds))
+
+    chars = sum(len(text) for text in responses)
+    # (case, seconds, the legacy case it is compared with)
+    results = [
+        ("legacy clean_text", best(lambda: [LegacyCleanText.clean(t) for t in responses]), "legacy clean_text"),
+        ("TextSanitizer.clean", best(lambda: [TextSanitizer.clean(t) for t in responses]), "legacy clean_text"),
+        ("legacy, joined stream", best(lambda: [stream_legacy(t) for t in streams]), "legacy, joined stream"),
+        ("TextSanitizer.feed (streamed)", best(lambda: [stream_sanitizer(t) for t in streams]), "legacy, joined stream"),
+        ("pipeline, legacy", best(lambda: [pipeline_legacy(t) for t in streams]), "pipeline, legacy"),
+        ("pipeline, TextSanitizer", best(lambda: [pipeline_sanitizer(t) for t in streams]), "pipeline, legacy"),
+    ]
+    seconds_of = {name: seconds for name, seconds, _ in results}
+    print(f"{args.responses} responses x {args.words} words ({chars / args.responses:.0f} chars each), "
+          f"best of {args.rounds} x {args.repeat} repeats")
+    for name, seconds, baseline in results:
+        mb_per_s = chars * args.repeat / seconds / 1e6
+        print(f"{name:32s} {seconds * 1000 / args.repeat:8.2f} ms/round  {mb_per_s:7.1f} MB/s  x{seconds_of[baseline] / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Offline load test for the voice pipeline.
+
+Serves the real WebApp and the real managers (built by web_main's builders, so their
+ResilientCaller policies, caches and phrase bank are all in the loop) on top of fake Groq and
+Google SDK clients (benchmarks/MockBackends.py) whose latencies come from a profile, then
+replays voicesamples/*.wav through /chat/audio/stream from N concurrent learner sessions and
+reports time-to-first-audio, throughput, memory and the components' counters.
+
+    python -m benchmarks.run_benchmark --sessions 16 --turns 5 --transport binary
+
+Needs the project's requirements installed but no network access or API keys, so it can gate
+CI: --max-ttfa-p95-ms exits non-zero when the p95 time-to-first-audio regresses past the given budget.
+The TTS and translation caches start empty in a temporary directory (--no-caches turns them off).
+"""
+import argparse
+import glob
+import http.client
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+import wave
+from concurrent.futures import Future
+
+import web_main
+from benchmarks.MockBackends import MockBackends
+from src.core.ConversationService import ConversationService
+from src.core.MetricsRegistry import MetricsRegistry
+from src.core.ResilientCaller import ResilientCaller
+from src.core.WorkerPool import WorkerPool
+from src.flask.WebApp import WebApp
+from src.Utils import Utils
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay voice samples against the pipeline with mocked providers.")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent learner sessions")
+    parser.add_argument("--turns", type=int, default=5, help="turns per session")
+    parser.add_argument("--transport", choices=("sse", "binary"), default="binary")
+    parser.add_argument("--profile", default=os.path.join(PROJECT_ROOT, "benchmarks", "profiles", "default.json"))
+    parser.add_argument("--samples", default=os.path.join(PROJECT_ROOT, "voicesamples", "*.wav"))
+    parser.add_argument("--server", choices=("dev", "pool"), default="pool", help="pool = waitress like server_mode \"pool\" (falls back to dev)")
+    parser.add_argument("--server-threads", type=int, default=48)
+    parser.add_argument("--max-concurrent-turns", type=int, default=32)
+    parser.add_argument("--io-workers", type=int, default=64)
+    parser.add_argument("--provider-workers", type=int, default=64)
+    parser.add_argument("--no-caches", action="store_true", help="run without the TTS and translation caches")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tracemalloc", action="store_true", help="also report peak Python heap (slows the run down)")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--max-ttfa-p95-ms", type=float, help="fail if p95 time-to-first-audio exceeds this")
+    return parser.parse_args()
+
+
+def start_server(web_app, mode, threads):
+    """Serve the app on a free local port from a background thread, returns the port."""
+    if mode == "pool":
+        try:
+            from waitress import create_server
+            server = create_server(web_app.app, host="127.0.0.1", port=0, threads=threads, send_bytes=1)
+            threading.Thread(target=server.run, daemon=True).start()
+            return server.effective_port
+        except ImportError:
+            print("waitress not installed, benchmarking the threaded dev server")
+    import logging
+    from werkzeug.serving import make_server
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # no access log line per turn
+    server = make_server("127.0.0.1", 0, web_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port
+
+
+def multipart_body(audio_bytes, filename, input_duration):
+    boundary = uuid.uuid4().hex
+    parts = [
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"input_duration\"\r\n\r\n{input_duration}\r\n".encode(),
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"audio\"; filename=\"{filename}\"\r\nContent-Type: audio/wav\r\n\r\n".encode(),
+        audio_bytes,
+        f"\r\n--{boundary}--\r\n".encode(),
+    ]
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def read_sse(response):
+    """Yield (event type, received at) for an SSE stream."""
+    for line in response:
+        if line.startswith(b"data: "):
+            yield json.loads(line[6:])["type"], time.perf_counter()
+
+
+def read_binary(response):
+    """Yield (event type, received at) for the binary frame stream, audio frames as "audio_chunk"."""
+    while True:
+        header = response.read(5)
+        if len(header) < 5:
+            return
+        frame_type, length = struct.unpack(">BI", header)
+        payload = response.read(length)
+        if frame_type == WebApp.FRAME_AUDIO:
+            yield "audio_chunk", time.perf_counter()
+        else:
+            yield json.loads(payload)["type"], time.perf_counter()
+
+
+def run_session(port, samples, turns, transport, results, index):
+    """One learner: sequential turns keeping the session cookie, a fresh connection per turn (streams end by closing it)."""
+    cookie = None
+    path = "/chat/audio/stream" + ("?transport=binary" if transport == "binary" else "")
+    for turn in range(turns):
+        filename, audio_bytes, duration = samples[(index + turn) % len(samples)]
+        body, content_type = multipart_body(audio_bytes, filename, duration)
+        headers = {"Content-Type": content_type}
+        if cookie:
+            headers["Cookie"] = cookie
+
+        start = time.perf_counter()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        result = {"session": index, "status": None, "ttfa_ms": None, "total_ms": None, "audio_chunks": 0, "outcome": None}
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            result["status"] = response.status
+            set_cookie = response.getheader("Set-Cookie")
+            if set_cookie:
+                cookie = set_cookie.split(";", 1)[0]
+            if response.status != 200:
+                response.read()
+                result["outcome"] = "http_error"
+            else:
+                events = read_binary(response) if transport == "binary" else read_sse(response)
+                for event_type, received_at in events:
+                    if event_type == "audio_chunk":
+                        result["audio_chunks"] += 1
+                        if result["ttfa_ms"] is None:
+                            result["ttfa_ms"] = (received_at - start) * 1000
+                    elif event_type in ("complete", "cancelled", "error"):
+                        result["outcome"] = event_type
+                response.read()
+        except Exception as e:
+            result["outcome"] = f"exception: {e}"
+        finally:
+            connection.close()
+        result["total_ms"] = (time.perf_counter() - start) * 1000
+        results.append(result)
+
+
+def percentiles(values):
+    if not values:
+        return {}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 1),
+        "p50": round(pick(0.50), 1),
+        "p95": round(pick(0.95), 1),
+        "p99": round(pick(0.99), 1),
+        "max": round(values[-1], 1),
+    }
+
+
+def peak_rss_mb():
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / 2**20, 1)
+    except ImportError:
+        pass
+    try:
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # KiB on Linux
+    except ImportError:
+        return None
+
+
+def load_samples(pattern):
+    samples = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "rb") as f:
+            audio_bytes = f.read()
+        with wave.open(path, "rb") as wav_file:
+            duration = wav_file.getnframes() / wav_file.getframerate()
+        samples.append((os.path.basename(path), audio_bytes, round(duration, 1)))
+    return samples
+
+
+def main():
+    args = parse_args()
+    samples = load_samples(args.samples)
+    if not samples:
+        sys.exit(f"No samples match {args.samples}")
+    with open(args.profile, "r", encoding="utf-8") as f:
+        profile = json.load(f)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    WorkerPool.configure(args.io_workers)
+    ResilientCaller.configure(args.provider_workers)
+    config = Utils.load_config()
+    config["max_sessions"] = max(config.get("max_sessions", 256), args.sessions)
+    if config.get("session_store", {}).get("backend") == "sqlite":
+        config["session_store"] = {**config["session_store"], "path": ":memory:"}  # same write path, without touching the real store
+    # the hosted providers are what's faked, so benchmark those backends; caches start empty, away from the real ones
+    cache_dir = tempfile.mkdtemp(prefix="tutor-benchmark-")
+    config.update(
+        stt_backend="groq",
+        tts_backend="google",
+        tts_cache_dir=None if args.no_caches else os.path.join(cache_dir, "tts"),
+        translation_cache_path=None if args.no_caches else os.path.join(cache_dir, "translations.sqlite3"),
+    )
+
+    backends = MockBackends(profile, seed=args.seed)
+    groq_client = backends.groq_client()
+    google_clients = Future()
+    google_clients.set_result(backends.google_clients())
+    metrics = MetricsRegistry()
+    stt = web_main.build_stt(config, metrics, groq_client=groq_client)
+    llm = web_main.build_llm(config, metrics, groq_client=groq_client)
+    tts = web_main.build_tts(config, google_clients, metrics)
+    translator = web_main.build_translator(config, google_clients, metrics)
+    conversation = ConversationService(llm=llm, stt=stt, tts=tts, translator=translator, config=config, selected_scenario="coffee_shop")
+    web_app = WebApp(conversation=conversation, max_concurrent_turns=args.max_concurrent_turns, metrics=metrics)
+    port = start_server(web_app, args.server, args.server_threads)
+
+    print(f"Benchmarking {args.sessions} sessions x {args.turns} turns over {args.transport}, {len(samples)} samples")
+    results = []
+    threads = [threading.Thread(target=run_session, args=(port, samples, args.turns, args.transport, results, i)) for i in range(args.sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_s = time.perf_counter() - start
+    snapshot = web_app.metrics.snapshot()
+
+    completed = [r for r in results if r["outcome"] == "complete"]
+    outcomes = {}
+    for r in results:
+        outcomes[r["outcome"]] = outcomes.get(r["outcome"], 0) + 1
+    report = {
+        "sessions": args.sessions,
+        "turns": len(results),
+        "transport": args.transport,
+        "outcomes": outcomes,
+        "elapsed_s": round(elapsed_s, 2),
+        "throughput_turns_per_s": round(len(completed) / elapsed_s, 2),
+        "time_to_first_audio_ms": percentiles([r["ttfa_ms"] for r in completed if r["ttfa_ms"] is not None]),
+        "turn_total_ms": percentiles([r["total_ms"] for r in completed]),
+        "peak_rss_mb": peak_rss_mb(),
+        "server_histograms": {name: {k: v for k, v in h.items() if k != "buckets"} for name, h in snapshot["histograms"].items()},
+        "server_counters": snapshot["counters"],
+        "components": conversation.component_stats(),
+    }
+    if args.tracemalloc:
+        report["peak_python_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    ttfa_p95 = report["time_to_first_audio_ms"].get("p95")
+    if args.max_ttfa_p95_ms is not None and (ttfa_p95 is None or ttfa_p95 > args.max_ttfa_p95_ms):
+        sys.exit(f"time-to-first-audio p95 {ttfa_p95}ms exceeds budget {args.max_ttfa_p95_ms}ms")
+    if len(completed) < len(results):
+        sys.exit(f"{len(results) - len(completed)} of {len(results)} turns did not complete")
+
+
+if __name__ == "__main__":
+    main()
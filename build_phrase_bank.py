@@ -0,0 +1,33 @@
+from src.tts.PhraseBank import PhraseBank
+from src.Utils import Utils
+from dotenv import load_dotenv
+import argparse
+
+# Pre-synthesizes phrase_bank_common and each roleplay scenario's "phrases" (config.json)
+# into the phrase bank TTSManager memory-maps at startup. Re-run after editing the phrases
+# or switching voices; a bank is only used with the voice it was built for.
+
+def build_backend(config, engine):
+    if engine == "local":
+        from src.tts.LocalTTSBackend import LocalTTSBackend
+        return LocalTTSBackend(**config.get("tts_local", {}))
+    from src.core.GoogleClients import GoogleClients
+    from src.tts.GoogleTTSBackend import GoogleTTSBackend
+    return GoogleTTSBackend(GoogleClients(config.get("google_credentials_path", "google_credentials.json")))
+
+def main():
+    load_dotenv()
+    config = Utils.load_config()
+    parser = argparse.ArgumentParser(description="Build the pre-synthesized phrase bank for the configured voice.")
+    parser.add_argument("--backend", choices=("google", "local"), default=config.get("tts_backend", "google"))
+    parser.add_argument("--out", default=config.get("tts_phrase_bank_dir", "cache/phrase_bank"))
+    args = parser.parse_args()
+
+    backend = build_backend(config, args.backend)
+    phrases = PhraseBank.phrases_from_config(config)
+    print(f"Synthesizing {len(phrases)} phrases with {backend.voice_name}")
+    count = PhraseBank.build(args.out, backend.voice_name, phrases, lambda text: b"".join(backend.stream_pcm(text)))
+    print(f"Wrote {count} phrases to {args.out}")
+
+if __name__ == "__main__":
+    main()
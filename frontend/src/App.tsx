@@ -4,7 +4,8 @@ import { AudioRecorder } from './components/AudioRecorder';
 import { MessageInput } from './components/MessageInput';
 import type { Message } from './types';
 import { AudioStreamPlayer } from './services/AudioStreamPlayer';
-import { streamAudio, sendText } from './services/api';
+import { streamAudioBinary, sendText, fetchVoiceSocketAvailable } from './services/api';
+import { VoiceSocket } from './services/VoiceSocket';
 import { useEffect } from 'react';
 
 function App() {
@@ -21,6 +22,51 @@ function App() {
   // Track the current response ID to handle interruptions and ignore stale chunks
   const responseIdRef = useRef<number>(0);
 
+  // Applies one streamed event (text, audio, translation...) to the assistant message it belongs to
+  const applyStreamEvent = async (data: any, assistantMessageId: string, isStale: boolean) => {
+    if (data.type === 'text') {
+      if (isStale) return; // Don't start new text if interrupted
+
+      setMessages(prev => [
+        ...prev,
+        {
+          id: Date.now().toString(),
+          role: 'user',
+          content: data.user_message
+        },
+        {
+          id: assistantMessageId,
+          role: 'assistant',
+          content: data.response,
+          isStreaming: true
+        }
+      ]);
+    } else if (data.type === 'text_chunk') {
+      if (isStale) return;
+      // Response text arrives sentence by sentence while the LLM is still generating
+      setMessages(prev => prev.map(m =>
+        m.id === assistantMessageId ? { ...m, content: m.content ? `${m.content} ${data.text}` : data.text } : m
+      ));
+    } else if (data.type === 'audio_chunk') {
+      if (isStale) return; // Don't play stale audio
+      setStatus('playing');
+      await audioPlayerRef.current.playChunk(data.chunk);
+    } else if (data.type === 'audio_end') {
+      if (isStale) return;
+      audioPlayerRef.current.finishStreaming();
+    } else if (data.type === 'translation') {
+      // ALWAYS update translation, even if stale, matching by ID
+      setMessages(prev => prev.map(m =>
+        m.id === assistantMessageId ? { ...m, translation: data.text } : m
+      ));
+    } else if (data.type === 'complete') {
+      // Only unset streaming if it's the current one, or maybe just purely by ID?
+      // Safer to just unset by ID if we could, but here we iterate.
+      // If stale, we might not want to touch global status, but updating message is fine.
+      setMessages(prev => prev.map(m => m.id === assistantMessageId ? { ...m, isStreaming: false } : m));
+    }
+  };
+
   const handleAudio = async (blob: Blob, duration: number) => {
     // Ignore empty or extremely short/invalid recordings
     if (blob.size < 100) {
@@ -54,46 +100,10 @@ function App() {
     // even if responseIdRef changes (interruption).
     const assistantMessageId = (Date.now() + 1).toString();
 
-    await streamAudio(blob, duration, async (data) => {
+    await streamAudioBinary(blob, duration, async (data) => {
       // IGNORE chunks if we have moved on to a new response, UNLESS it's a translation update
       // We want to capture translations for previous messages so they don't get lost.
-      const isStale = responseIdRef.current !== currentResponseId;
-
-      if (data.type === 'text') {
-        if (isStale) return; // Don't start new text if interrupted
-
-        setMessages(prev => [
-          ...prev,
-          {
-            id: Date.now().toString(),
-            role: 'user',
-            content: data.user_message
-          },
-          {
-            id: assistantMessageId,
-            role: 'assistant',
-            content: data.response,
-            isStreaming: true
-          }
-        ]);
-      } else if (data.type === 'audio_chunk') {
-        if (isStale) return; // Don't play stale audio
-        setStatus('playing');
-        await audioPlayerRef.current.playChunk(data.chunk);
-      } else if (data.type === 'audio_end') {
-        if (isStale) return;
-        audioPlayerRef.current.finishStreaming();
-      } else if (data.type === 'translation') {
-        // ALWAYS update translation, even if stale, matching by ID
-        setMessages(prev => prev.map(m =>
-          m.id === assistantMessageId ? { ...m, translation: data.text } : m
-        ));
-      } else if (data.type === 'complete') {
-        // Only unset streaming if it's the current one, or maybe just purely by ID?
-        // Safer to just unset by ID if we could, but here we iterate.
-        // If stale, we might not want to touch global status, but updating message is fine.
-        setMessages(prev => prev.map(m => m.id === assistantMessageId ? { ...m, isStreaming: false } : m));
-      }
+      await applyStreamEvent(data, assistantMessageId, responseIdRef.current !== currentResponseId);
     }, () => {
       // On stream close - relying on audio_end/finishStreaming for state change
     }, (err: any) => {
@@ -112,6 +122,70 @@ function App() {
     });
   };
 
+  // Hands-free mode: mic audio streams over a WebSocket and the server detects when you stop talking
+  const [handsFree, setHandsFree] = useState(false);
+  // the toggle only shows when the server serves /ws/voice (not under the pooled waitress server)
+  const [voiceSocketAvailable, setVoiceSocketAvailable] = useState(false);
+  useEffect(() => {
+    fetchVoiceSocketAvailable().then(setVoiceSocketAvailable);
+  }, []);
+  const voiceSocketRef = useRef<VoiceSocket | null>(null);
+  const socketAssistantIdRef = useRef<string>('');
+
+  const handleVoiceSocketEvent = async (data: any) => {
+    if (data.type === 'speech_start') {
+      audioPlayerRef.current.stop();
+      responseIdRef.current = Date.now();
+      setStatus('recording');
+      return;
+    }
+    if (data.type === 'speech_end') {
+      setStatus('processing');
+      return;
+    }
+    if (data.type === 'error') {
+      console.error("Voice socket error", data.error);
+      setStatus('idle');
+      return;
+    }
+    if (data.type === 'text') {
+      // New turn from the server
+      const currentResponseId = Date.now();
+      responseIdRef.current = currentResponseId;
+      socketAssistantIdRef.current = (currentResponseId + 1).toString();
+      await audioPlayerRef.current.initialize();
+      audioPlayerRef.current.onPlaybackComplete = () => {
+        if (responseIdRef.current === currentResponseId) setStatus('idle');
+      };
+    }
+    await applyStreamEvent(data, socketAssistantIdRef.current, false);
+  };
+
+  const toggleHandsFree = async () => {
+    if (voiceSocketRef.current) {
+      voiceSocketRef.current.stop();
+      voiceSocketRef.current = null;
+      setHandsFree(false);
+      return;
+    }
+    try {
+      await audioPlayerRef.current.initialize(); // resume the AudioContext while we have a user gesture
+      const socket = new VoiceSocket(handleVoiceSocketEvent, () => {
+        // server closed the socket or doesn't serve /ws/voice (pooled server mode)
+        console.error("Hands-free voice connection closed");
+        voiceSocketRef.current = null;
+        setHandsFree(false);
+        setStatus('idle');
+      });
+      await socket.start();
+      voiceSocketRef.current = socket;
+      setHandsFree(true);
+    } catch (err) {
+      console.error("Could not start hands-free mode:", err);
+      alert("Could not access microphone");
+    }
+  };
+
   const handleText = async (text: string) => {
     // Generate new response ID
     const currentResponseId = Date.now();
@@ -245,10 +319,33 @@ function App() {
                 // Force status to idle so we are ready for the new interaction
                 setStatus('idle');
               }}
-              disabled={status === 'processing'}
+              disabled={status === 'processing' || handsFree}
             />
           </div>
 
+          {/* Hands-free (streaming) voice mode */}
+          {voiceSocketAvailable && (
+            <button
+              onClick={toggleHandsFree}
+              className={`text-sm rounded-full px-4 py-1.5 border transition-colors duration-300 ${handsFree
+                ? 'bg-primary/20 border-primary text-secondary'
+                : 'bg-surface/50 border-white/5 text-subtle hover:text-secondary'
+                }`}
+            >
+              {handsFree ? 'Hands-free on' : 'Hands-free'}
+            </button>
+          )}
+
+          {/* Hands-free: end the utterance now instead of waiting for the silence timeout */}
+          {handsFree && status === 'recording' && (
+            <button
+              onClick={() => voiceSocketRef.current?.endOfSpeech()}
+              className="text-sm rounded-full px-4 py-1.5 border bg-surface/50 border-white/5 text-subtle hover:text-secondary transition-colors duration-300"
+            >
+              Done talking
+            </button>
+          )}
+
           {/* Secondary Text Input */}
           <div className="w-full max-w-lg opacity-50 hover:opacity-100 focus-within:opacity-100 transition-opacity duration-300">
             <div className="bg-surface/50 rounded-full px-1 backdrop-blur-sm">
@@ -1,12 +1,49 @@
-import React from 'react';
-import type { Message } from '../types';
+import React, { useEffect, useState } from 'react';
+import type { Message, WordTranslation } from '../types';
+import { wordTranslations } from '../services/WordTranslations';
 
 interface Props {
     message: Message;
 }
 
+// Message text with a hover translation on each word (offsets are code points, hence Array.from)
+const HoverableText: React.FC<{ text: string; words: WordTranslation[] }> = ({ text, words }) => {
+    const chars = Array.from(text);
+    const parts: React.ReactNode[] = [];
+    let cursor = 0;
+    words.forEach((w, i) => {
+        if (w.start > cursor) parts.push(chars.slice(cursor, w.start).join(''));
+        parts.push(
+            <span
+                key={i}
+                title={w.translation ?? undefined}
+                className={w.translation ? 'rounded hover:bg-white/10 cursor-help transition-colors' : undefined}
+            >
+                {chars.slice(w.start, w.end).join('')}
+            </span>
+        );
+        cursor = w.end;
+    });
+    if (cursor < chars.length) parts.push(chars.slice(cursor).join(''));
+    return <>{parts}</>;
+};
+
 export const MessageBubble: React.FC<Props> = ({ message }) => {
     const isUser = message.role === 'user';
+    const [words, setWords] = useState<WordTranslation[] | null>(null);
+    // fetched on the first hover or focus, a restored backlog of replies costs nothing until read
+    const [wanted, setWanted] = useState(false);
+    // only finished assistant replies, the text is still changing while it streams
+    const translatable = !isUser && !message.isStreaming && !!message.content;
+
+    useEffect(() => {
+        if (!translatable || !wanted) return;
+        let cancelled = false;
+        wordTranslations.get(message.content)
+            .then(result => { if (!cancelled) setWords(result); })
+            .catch(err => console.error('Word translation failed', err));
+        return () => { cancelled = true; };
+    }, [translatable, wanted, message.content]);
 
     return (
         <div className={`flex w-full ${isUser ? 'justify-end' : 'justify-start'}`}>
@@ -14,7 +51,14 @@ export const MessageBubble: React.FC<Props> = ({ message }) => {
                     ? 'bg-surface/50 text-secondary font-sans'
                     : 'bg-transparent text-secondary font-serif text-lg leading-relaxed'
                 }`}>
-                <p className="whitespace-pre-wrap">{message.content}</p>
+                <p
+                    className="whitespace-pre-wrap"
+                    tabIndex={translatable ? 0 : undefined}
+                    onMouseEnter={translatable ? () => setWanted(true) : undefined}
+                    onFocus={translatable ? () => setWanted(true) : undefined}
+                >
+                    {words ? <HoverableText text={message.content} words={words} /> : message.content}
+                </p>
 
                 {message.translation && (
                     <div className="mt-2 pt-2 border-t border-white/5">
@@ -20,7 +20,10 @@ export class AudioUtils {
             bytes[i] = binaryString.charCodeAt(i);
         }
 
-        const pcmData = new Int16Array(bytes.buffer);
+        return AudioUtils.int16ToFloat(new Int16Array(bytes.buffer));
+    }
+
+    static int16ToFloat(pcmData: Int16Array): Float32Array {
         const floatData = new Float32Array(pcmData.length);
         for (let i = 0; i < pcmData.length; i++) {
             floatData[i] = pcmData[i] / 32768.0;
@@ -58,9 +61,12 @@ export class AudioStreamPlayer {
         this.streamingComplete = false;
     }
 
-    async playChunk(base64Chunk: string) {
+    // Accepts base64 chunks (SSE transport) or raw PCM (binary transport)
+    async playChunk(chunk: string | Int16Array) {
         try {
-            const floatData = AudioUtils.base64ToPCM(base64Chunk);
+            const floatData = typeof chunk === 'string'
+                ? AudioUtils.base64ToPCM(chunk)
+                : AudioUtils.int16ToFloat(chunk);
 
             const audioBufferNode = this.audioContext.createBuffer(1, floatData.length, this.sampleRate);
             audioBufferNode.getChannelData(0).set(floatData);
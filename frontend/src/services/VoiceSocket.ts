@@ -0,0 +1,76 @@
+import { FrameParser } from './api';
+
+const TARGET_SAMPLE_RATE = 16000; // what the server-side VAD and STT expect
+
+// Full-duplex voice session: streams microphone PCM to /ws/voice while it is captured,
+// the server detects the end of each utterance and streams the reply back as binary frames.
+export class VoiceSocket {
+    private ws: WebSocket | null = null;
+    private stream: MediaStream | null = null;
+    private audioContext: AudioContext | null = null;
+    private processor: ScriptProcessorNode | null = null;
+    private onEvent: (data: any) => void;
+    private onClose: () => void;
+
+    // onClose: the socket closed on its own (server went away, or it doesn't offer /ws/voice)
+    constructor(onEvent: (data: any) => void, onClose: () => void = () => {}) {
+        this.onEvent = onEvent;
+        this.onClose = onClose;
+    }
+
+    async start() {
+        const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        const ws = new WebSocket(`${protocol}://${window.location.host}/ws/voice`);
+        ws.binaryType = 'arraybuffer';
+        const parser = new FrameParser(this.onEvent);
+        ws.onmessage = (e) => parser.push(new Uint8Array(e.data));
+        ws.onclose = () => {
+            if (this.ws !== ws) return; // closed by stop()
+            this.stop();
+            this.onClose();
+        };
+        this.ws = ws;
+
+        this.stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+        this.audioContext = new (window.AudioContext || (window as any).webkitAudioContext)();
+        const source = this.audioContext.createMediaStreamSource(this.stream);
+        this.processor = this.audioContext.createScriptProcessor(4096, 1, 1);
+
+        const inputRate = this.audioContext.sampleRate;
+        this.processor.onaudioprocess = (e) => {
+            if (ws.readyState !== WebSocket.OPEN) return;
+            ws.send(VoiceSocket.toInt16(e.inputBuffer.getChannelData(0), inputRate).buffer);
+        };
+        source.connect(this.processor);
+        this.processor.connect(this.audioContext.destination);
+    }
+
+    // Force the end of the current utterance instead of waiting for silence ("Done talking")
+    endOfSpeech() {
+        if (this.ws?.readyState === WebSocket.OPEN) {
+            this.ws.send(JSON.stringify({ type: 'end_of_speech' }));
+        }
+    }
+
+    stop() {
+        this.processor?.disconnect();
+        this.stream?.getTracks().forEach(track => track.stop());
+        this.audioContext?.close();
+        if (this.ws && this.ws.readyState <= WebSocket.OPEN) this.ws.close();
+        this.processor = null;
+        this.stream = null;
+        this.audioContext = null;
+        this.ws = null;
+    }
+
+    // Downsample float samples to 16kHz and convert to 16-bit PCM
+    private static toInt16(input: Float32Array, inputRate: number): Int16Array {
+        const ratio = inputRate / TARGET_SAMPLE_RATE;
+        const output = new Int16Array(Math.floor(input.length / ratio));
+        for (let i = 0; i < output.length; i++) {
+            const sample = Math.max(-1, Math.min(1, input[Math.floor(i * ratio)]));
+            output[i] = sample < 0 ? sample * 0x8000 : sample * 0x7fff;
+        }
+        return output;
+    }
+}
@@ -0,0 +1,49 @@
+import { translateWords } from './api';
+import type { WordTranslation } from '../types';
+
+const BATCH_WINDOW_MS = 30; // messages that ask within this window share one request
+const MAX_BATCH_SENTENCES = 200; // server-side limit per request
+
+interface Pending {
+    text: string;
+    resolve: (words: WordTranslation[]) => void;
+    reject: (err: any) => void;
+}
+
+// Hover translations for message text. A bubble asks on its first hover or focus; asks that land
+// within the batch window (e.g. the pointer sweeping over several replies) are coalesced into a
+// single /translate/words call, and results are kept per text so re-renders never refetch.
+class WordTranslationBatcher {
+    private results = new Map<string, Promise<WordTranslation[]>>();
+    private pending: Pending[] = [];
+    private timer: ReturnType<typeof setTimeout> | null = null;
+
+    get(text: string): Promise<WordTranslation[]> {
+        let result = this.results.get(text);
+        if (!result) {
+            result = new Promise((resolve, reject) => {
+                this.pending.push({ text, resolve, reject });
+                if (!this.timer) this.timer = setTimeout(() => this.flush(), BATCH_WINDOW_MS);
+            });
+            // forget failures so a later hover can retry
+            result.catch(() => this.results.delete(text));
+            this.results.set(text, result);
+        }
+        return result;
+    }
+
+    private async flush() {
+        this.timer = null;
+        const batch = this.pending.splice(0, MAX_BATCH_SENTENCES);
+        if (this.pending.length) this.timer = setTimeout(() => this.flush(), 0);
+
+        try {
+            const sentences = await translateWords(batch.map(p => p.text));
+            batch.forEach((p, i) => p.resolve(sentences[i] ?? []));
+        } catch (err) {
+            batch.forEach(p => p.reject(err));
+        }
+    }
+}
+
+export const wordTranslations = new WordTranslationBatcher();
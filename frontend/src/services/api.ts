@@ -1,10 +1,35 @@
+import type { WordTranslation } from '../types';
+
 export const sendText = async (text: string) => {
     const res = await fetch('/chat', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ message: text })
     });
-    return res.json();
+    const data = await res.json();
+    if (!res.ok) throw new Error(data.error || `Chat failed (${res.status})`);
+    return data;
+};
+
+// Whether the server offers the hands-free voice socket (/ws/voice), from /ready.
+// /ready answers 503 while backends warm up, its body still carries the flag.
+export const fetchVoiceSocketAvailable = async (): Promise<boolean> => {
+    try {
+        const res = await fetch('/ready');
+        return (await res.json()).voice_socket === true;
+    } catch {
+        return false;
+    }
+};
+
+export const translateWords = async (sentences: string[], source = 'es', target = 'en'): Promise<WordTranslation[][]> => {
+    const res = await fetch('/translate/words', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ sentences, source, target })
+    });
+    if (!res.ok) throw new Error('Word translation failed');
+    return (await res.json()).sentences;
 };
 
 export const streamAudio = async (
@@ -66,3 +91,83 @@ export const streamAudio = async (
         onError(e);
     }
 };
+
+// Binary transport frames: 1-byte type, 4-byte big-endian length, payload
+const FRAME_AUDIO = 1; // raw 24kHz 16-bit little-endian mono PCM
+const FRAME_EVENT = 2; // UTF-8 JSON, same payloads as the SSE events
+
+// Reassembles frames from arbitrarily split byte chunks (fetch body reads or WebSocket messages)
+export class FrameParser {
+    private buffer = new Uint8Array(0);
+    private decoder = new TextDecoder();
+    private onEvent: (data: any) => void;
+
+    constructor(onEvent: (data: any) => void) {
+        this.onEvent = onEvent;
+    }
+
+    push(value: Uint8Array) {
+        // Append the new bytes to whatever partial frame is left over
+        const merged = new Uint8Array(this.buffer.length + value.length);
+        merged.set(this.buffer);
+        merged.set(value, this.buffer.length);
+        const buffer = merged;
+
+        let offset = 0;
+        while (buffer.length - offset >= 5) {
+            const view = new DataView(buffer.buffer, buffer.byteOffset + offset, 5);
+            const frameType = view.getUint8(0);
+            const length = view.getUint32(1);
+            if (buffer.length - offset - 5 < length) break; // wait for the rest of the frame
+
+            const payload = buffer.subarray(offset + 5, offset + 5 + length);
+            offset += 5 + length;
+
+            if (frameType === FRAME_AUDIO) {
+                // slice() copies into a fresh, 2-byte aligned buffer for the Int16Array view
+                this.onEvent({ type: 'audio_chunk', chunk: new Int16Array(payload.slice().buffer) });
+            } else if (frameType === FRAME_EVENT) {
+                try {
+                    this.onEvent(JSON.parse(this.decoder.decode(payload)));
+                } catch (e) {
+                    console.error("Parse error", e);
+                }
+            }
+        }
+        this.buffer = buffer.subarray(offset);
+    }
+}
+
+export const streamAudioBinary = async (
+    audioBlob: Blob,
+    duration: number,
+    onChunk: (data: any) => void,
+    onComplete: () => void,
+    onError: (err: any) => void
+) => {
+    const formData = new FormData();
+    formData.append('audio', audioBlob);
+    formData.append('input_duration', duration.toString());
+
+    try {
+        const response = await fetch('/chat/audio/stream?transport=binary', {
+            method: 'POST',
+            body: formData
+        });
+
+        if (!response.ok) throw new Error("Upload failed");
+
+        const reader = response.body?.getReader();
+        if (!reader) throw new Error("No readable stream");
+
+        const parser = new FrameParser(onChunk);
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            parser.push(value);
+        }
+        onComplete();
+    } catch (e) {
+        onError(e);
+    }
+};
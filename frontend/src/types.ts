@@ -1,3 +1,10 @@
+export interface WordTranslation {
+    word: string;
+    start: number; // code point offsets into the message content
+    end: number;
+    translation: string | null;
+}
+
 export interface Message {
     id: string;
     role: 'user' | 'assistant';
@@ -6,7 +6,10 @@ export default defineConfig({
   plugins: [react()],
   server: {
     proxy: {
-      '/chat': 'http://127.0.0.1:5000'
+      '/chat': 'http://127.0.0.1:5000',
+      '/ready': 'http://127.0.0.1:5000',
+      '/translate': 'http://127.0.0.1:5000',
+      '/ws': { target: 'ws://127.0.0.1:5000', ws: true }
     }
   }
 })
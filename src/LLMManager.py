@@ -1,24 +1,98 @@
 from src.Utils import Utils
+from src.core.ResilientCaller import ResilientCaller
 import os
 from groq import Groq
+import threading
 import time
 
 class LLMManager():
 
-    def __init__(self, model_name: str = "llama-3.3-70b-versatile", api_key: str = None):
+    def __init__(self, model_name: str = "llama-3.3-70b-versatile", api_key: str = None, fallback_model_name: str = None, policy: ResilientCaller = None, client=None):
         self.model_name = model_name
-        self.client = Groq(api_key=api_key)
+        self.fallback_model_name = fallback_model_name  # smaller model used while the main one is failing
+        self.policy = policy or ResilientCaller("llm")
+        # retries are the policy's job, the SDK's own only stack latency on top of it
+        self.client = client or Groq(api_key=api_key, timeout=self.policy.timeout_s, max_retries=0)  # client: e.g. the benchmark's fake
+        # prompt token counters, to see how much the stable system prefix saves
+        self.usage_lock = threading.Lock()
+        self.turns = 0
+        self.prompt_tokens_total = 0
+        self.cached_tokens_total = 0
+
+    def warm_up(self):
+        """Cheap request that opens the HTTPS connection, so the first turn doesn't pay for the TLS handshake"""
+        self.client.models.list()
 
     def ask(self, prompt: str) -> str:
+        return self.ask_messages([{"role": "user", "content": prompt}])
+
+    def ask_stream(self, prompt: str):
+        return self.ask_messages_stream([{"role": "user", "content": prompt}])
+
+    def ask_messages(self, messages: list) -> str:
+        """Send structured chat messages (see MemoryState.build_messages) and return the cleaned reply"""
+        fallback = (lambda: self._complete(messages, self.fallback_model_name)) if self.fallback_model_name else None
+        return Utils.clean_text(self.policy.call(self._complete, messages, self.model_name, fallback=fallback))
 
+    def _complete(self, messages, model_name):
         chat_completion = self.client.chat.completions.create(
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            model=self.model_name,
+            messages=messages,
+            model=model_name,
+        )
+        self._record_usage(chat_completion.usage)
+        return chat_completion.choices[0].message.content
+
+    def ask_messages_stream(self, messages: list, turn=None):
+        """Generator that yields raw token deltas as the LLM produces them (not cleaned), stops early if `turn` is cancelled"""
+        fallback = (lambda: self._stream(messages, self.fallback_model_name, turn)) if self.fallback_model_name else None
+        return self.policy.stream(lambda: self._stream(messages, self.model_name, turn), fallback=fallback)
+
+    def _stream(self, messages, model_name, turn=None):
+        stream = self.client.chat.completions.create(
+            messages=messages,
+            model=model_name,
+            stream=True,
         )
-            
-        return Utils.clean_text(chat_completion.choices[0].message.content)
+        if turn:
+            turn.on_cancel(stream.close)  # drops the HTTP response so generation stops being billed/read
+
+        try:
+            for chunk in stream:
+                if turn and turn.cancelled:
+                    return
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                # Groq reports usage on the final chunk of a stream
+                x_groq = getattr(chunk, "x_groq", None)
+                if x_groq is not None and getattr(x_groq, "usage", None):
+                    self._record_usage(x_groq.usage)
+        except Exception:
+            if turn and turn.cancelled:
+                return  # reading a stream we closed ourselves
+            raise
+        finally:
+            stream.close()
+
+    def _record_usage(self, usage):
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+        with self.usage_lock:
+            self.turns += 1
+            self.prompt_tokens_total += prompt_tokens
+            self.cached_tokens_total += cached_tokens
+        print(f"LLM prompt tokens this turn: {prompt_tokens} ({cached_tokens} cached)")
+
+    def usage_stats(self):
+        with self.usage_lock:
+            return {
+                "turns": self.turns,
+                "prompt_tokens_total": self.prompt_tokens_total,
+                "cached_tokens_total": self.cached_tokens_total,
+                "prompt_tokens_per_turn": self.prompt_tokens_total / self.turns if self.turns else 0.0,
+            }
+
+    def stats(self):
+        return {"usage": self.usage_stats(), "provider": self.policy.stats()}
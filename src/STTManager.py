@@ -1,40 +1,131 @@
-from groq import Groq
-import sounddevice as sd
-import soundfile as sf
+from src.core.WorkerPool import WorkerPool
+from src.core.ResilientCaller import ResilientCaller
+import io
+import os
+import threading
 import time
 
 class STTManager():
-    def __init__(self, api_key: str = None, model_name: str = "whisper-large-v3-turbo", output_audio_path = "audio/output/Recording.wav"):
+    TARGET_SAMPLE_RATE = 16000  # Whisper resamples to 16kHz mono anyway, so anything more is wasted upload
+    ACCEPTED_LANGUAGES = ("Spanish", "English")
+
+    # How to handle auto-detect picking some other language:
+    #   "fallback"    - re-transcribe with language="es" afterwards (two sequential calls)
+    #   "speculative" - always race an "es" request alongside auto-detect, so the fallback costs no extra latency
+    #   "session"     - "fallback" until a session hits the fallback, then "speculative" for that session until
+    #                   `session_speculative_turns` turns in a row were detected cleanly
+    LANGUAGE_STRATEGIES = ("fallback", "speculative", "session")
+
+    def __init__(self, api_key: str = None, model_name: str = "whisper-large-v3-turbo", output_audio_path = "audio/output/Recording.wav", downsample: bool = False, language_strategy: str = "fallback", backend=None, fallback_backend=None, policy: ResilientCaller = None, session_speculative_turns: int = 5):
         self.api_key = api_key
-        if not self.api_key:
-            raise ValueError("Groq API key is required. Set GROQ_API_KEY in .env or pass as argument.")
-        self.client = Groq(api_key=self.api_key)
         self.model_name = model_name
+        self.policy = policy or ResilientCaller("stt")
+        if backend is None:
+            from src.stt.GroqSTTBackend import GroqSTTBackend
+            backend = GroqSTTBackend(api_key=api_key, model_name=model_name, timeout_s=self.policy.timeout_s)
+        self.backend = backend  # STTBackend doing the actual transcription (Groq API or a local model)
+        self.fallback_backend = fallback_backend  # e.g. a lighter Whisper model, used while the backend is failing
         self.output_audio_path = output_audio_path
+        self.downsample = downsample
+        if language_strategy not in self.LANGUAGE_STRATEGIES:
+            raise ValueError(f"Unknown STT language strategy: {language_strategy}")
+        self.language_strategy = language_strategy
+        self.session_speculative_turns = session_speculative_turns
+        self.stats_lock = threading.Lock()
+        self.transcriptions = 0
+        self.fallbacks = 0
+        self.speculative_requests = 0
+        self.speculative_used = 0  # speculative "es" requests whose result was actually needed
+
+    def warm_up(self):
+        self.backend.warm_up()
 
     def transcribe_audio(self, audio_file_path: str) -> str:
+        with open(audio_file_path, "rb") as file:
+            audio_bytes = file.read()
+        return self.transcribe_audio_bytes(audio_bytes, filename=os.path.basename(audio_file_path))
+
+    def transcribe_audio_bytes(self, audio_bytes, filename: str = "audio.wav") -> str:
+        """Transcribe audio held in memory (bytes or memoryview), no temp files involved"""
+        text, _ = self.transcribe_audio_detailed(audio_bytes, filename)
+        return text
+
+    def transcribe_audio_detailed(self, audio_bytes, filename: str = "audio.wav", speculative_turns: int = 0):
+        """
+        Transcribe in-memory audio, returns (text, fell_back) so callers can remember per-session misdetection.
+        `speculative_turns` is what the session has left (see speculative_turns_after), it only matters for "session".
+        """
         try:
-            
-            with open(audio_file_path, "rb") as file:
-                transcription = self.client.audio.transcriptions.create(
-                    file=(audio_file_path, file.read()),
-                    model=self.model_name,
-                    response_format="verbose_json",
-                )
-
-            if transcription.language != "Spanish" and transcription.language != "English":
+            if self.downsample:
+                audio_bytes, filename = self._downsample(audio_bytes, filename)
+            audio_bytes = bytes(audio_bytes)
+
+            speculative = not self.backend.constrained_language_detection and (
+                self.language_strategy == "speculative" or (self.language_strategy == "session" and speculative_turns > 0)
+            )
+            spanish_future = None
+            if speculative:
+                spanish_future = WorkerPool.submit(self._transcribe, audio_bytes, filename, "es")
+
+            transcription = self._transcribe(audio_bytes, filename)
+            fell_back = transcription.language not in self.ACCEPTED_LANGUAGES
+            with self.stats_lock:
+                self.transcriptions += 1
+                self.fallbacks += fell_back
+                self.speculative_requests += speculative
+                self.speculative_used += speculative and fell_back
+
+            if fell_back:
                 print(f"detected {transcription.language} defaulting to Spanish")
-                with open(audio_file_path, "rb") as file:
-                    transcription = self.client.audio.transcriptions.create(
-                        file=(audio_file_path, file.read()),
-                        model=self.model_name,
-                        language="es",
-                        response_format="verbose_json",
-                    )
-            return transcription.text
+                if spanish_future:
+                    transcription = spanish_future.result()
+                else:
+                    transcription = self._transcribe(audio_bytes, filename, "es")
+            return transcription.text, fell_back
         except Exception as e:
             print(f"Error during transcription: {e}")
-            return None
+            return None, False
+
+    def speculative_turns_after(self, speculative_turns, fell_back):
+        """A session's speculative turns after a transcription: a fallback re-arms them all, each clean detection uses one up"""
+        if fell_back:
+            return self.session_speculative_turns
+        return max(speculative_turns - 1, 0)
 
+    def _transcribe(self, audio_bytes, filename, language=None):
+        fallback = (lambda: self.fallback_backend.transcribe(audio_bytes, filename, language)) if self.fallback_backend else None
+        return self.policy.call(self.backend.transcribe, audio_bytes, filename, language, fallback=fallback)
+
+    def stats(self):
+        with self.stats_lock:
+            stats = {
+                "transcriptions": self.transcriptions,
+                "fallbacks": self.fallbacks,
+                "fallback_rate": self.fallbacks / self.transcriptions if self.transcriptions else 0.0,
+                "speculative_requests": self.speculative_requests,
+                "speculative_used": self.speculative_used,
+            }
+        stats["provider"] = self.policy.stats()
+        backend_stats = self.backend.stats()
+        if backend_stats is not None:
+            stats["backend"] = backend_stats  # e.g. the local model's micro-batcher
+        return stats
+
+    def _downsample(self, audio_bytes, filename):
+        """Transcode to 16kHz mono 16-bit WAV to shrink the upload, returns the input unchanged if it can't be decoded"""
+        try:
+            import numpy as np
+            import soundfile as sf  # imported here so startup doesn't pay for libsndfile until it's needed
+            samples, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=True)
+        except Exception:
+            return audio_bytes, filename  # e.g. webm/opus from the browser, which is already compact
 
+        mono = samples.mean(axis=1)
+        if sample_rate != self.TARGET_SAMPLE_RATE:
+            target_length = int(len(mono) * self.TARGET_SAMPLE_RATE / sample_rate)
+            positions = np.linspace(0, len(mono) - 1, num=target_length)
+            mono = np.interp(positions, np.arange(len(mono)), mono).astype("float32")
 
+        output = io.BytesIO()
+        sf.write(output, mono, self.TARGET_SAMPLE_RATE, subtype="PCM_16", format="WAV")
+        return output.getbuffer(), "audio.wav"
@@ -1,73 +1,100 @@
-import google.auth.credentials
-from google.cloud import texttospeech
 import json
-import google.auth
-from google.oauth2 import service_account
-import google.auth.transport.requests
-import requests
 import base64
-import sounddevice as sd
-import soundfile as sf
+import io
 import threading
 import time
+from collections import OrderedDict
+from src.core.AudioCache import AudioCache
+from src.core.ResilientCaller import ResilientCaller
+from src.tts.TTSBackend import TTSBackend
+from src.tts.PhraseBank import PhraseBank
 
 class TTSManager():
 
-    def __init__(self, google_credentials_path: str = "C:/Users/Willo/Documents/projects/SpanishTutor/google_credentials.json"):
+    def __init__(self, google_credentials_path: str = "C:/Users/Willo/Documents/projects/SpanishTutor/google_credentials.json", cache_dir: str = None, cache_max_bytes: int = 200 * 1024 * 1024, clients = None, backend: TTSBackend = None, phrase_bank_dir: str = None, policy: ResilientCaller = None):
         self.google_credentials_path = google_credentials_path
-        credentials = service_account.Credentials.from_service_account_file(
-            google_credentials_path, scopes=["https://www.googleapis.com/auth/cloud-platform"]
-        )
-        auth_req = google.auth.transport.requests.Request()
-        credentials.refresh(auth_req)
-        self.access_token = credentials.token
-        self.url = "https://texttospeech.googleapis.com/v1/text:synthesize"
-        self.grpc_client = texttospeech.TextToSpeechClient(credentials=credentials)
-        self.voice = texttospeech.VoiceSelectionParams(
-            language_code="es-US",
-            name="es-US-Chirp3-HD-Achernar"
-        )
-        self.streaming_config = texttospeech.StreamingSynthesizeConfig( # Create streaming config
-            voice=self.voice
-        )
-        self.is_playing = False  # track playback status
+        self.cache = AudioCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+        self.policy = policy or ResilientCaller("tts")
+        if backend is None:
+            from src.core.GoogleClients import GoogleClients
+            from src.tts.GoogleTTSBackend import GoogleTTSBackend
+            backend = GoogleTTSBackend(clients or GoogleClients(google_credentials_path), timeout_s=self.policy.timeout_s)
+        self.backend = backend  # TTSBackend for text the phrase bank and cache don't have (Google Cloud or a local voice)
+        # pre-synthesized scenario phrases for this voice, see build_phrase_bank.py
+        self.phrase_bank = PhraseBank.load(phrase_bank_dir, backend.voice_name) if phrase_bank_dir else None
+        self.playback_idle = threading.Event()  # set while nothing is playing, replaces polling is_playing
+        self.playback_idle.set()
+        self.short_phrases = OrderedDict()  # normalized short sentence -> times seen, most recent last
+        self.short_phrases_lock = threading.Lock()
+
+    def warm_up(self):
+        self.backend.warm_up()
+
+    @property
+    def is_playing(self):  # track playback status
+        return not self.playback_idle.is_set()
+
+    @is_playing.setter
+    def is_playing(self, playing):
+        if playing:
+            self.playback_idle.clear()
+        else:
+            self.playback_idle.set()
+
+    # cache encodings: whole-utterance WAV files and raw 24kHz 16-bit PCM streams
+    WAV_ENCODING = "LINEAR16_WAV"
+    PCM_ENCODING = "LINEAR16_PCM_24K"
+
+    RECURRING_SHORT_PHRASE = 2  # a short sentence seen this often is synthesized (and cached) on its own
+    MAX_SHORT_PHRASES = 1024
+
+    def keep_sentence_alone(self, text):
+        """
+        SentenceChunker keep_short predicate: whether a sentence too short for its own TTS request
+        should still be spoken on its own. Banked or cached audio plays without any request, and
+        a short phrase that keeps coming back ("¡Muy bien!") earns its own cache entry, which a
+        sentence merged into the next one never gets.
+        """
+        if self.phrase_bank and text in self.phrase_bank:
+            return True
+        if not self.cache:
+            return False
+        if self.cache.contains(text, self.backend.voice_name, self.PCM_ENCODING):
+            return True
+        key = PhraseBank.normalize(text)
+        with self.short_phrases_lock:
+            seen = self.short_phrases.pop(key, 0) + 1
+            self.short_phrases[key] = seen
+            if len(self.short_phrases) > self.MAX_SHORT_PHRASES:
+                self.short_phrases.popitem(last=False)
+        return seen >= self.RECURRING_SHORT_PHRASE
 
     def synthesize_speech(self, text):
         # Wait for previous audio to finish before overwriting
-        while self.is_playing:
-            time.sleep(0.1)
-            
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.access_token}",
-        }
+        self.playback_idle.wait()
 
-        body = {
-            "input": {
-                "markup": text
-            },
-            "voice": {
-                "languageCode": "es-US",
-                "name": "es-US-Chirp3-HD-Achernar",
-                "voiceClone": {}
-            },
-            "audioConfig": {
-                "audioEncoding": "LINEAR16"
-            }
-        }
+        if self.phrase_bank:
+            banked = self.phrase_bank.get(text)
+            if banked is not None:
+                return base64.b64encode(TTSBackend.pcm_to_wav(banked)).decode()
 
-        response = requests.post(self.url, headers=headers, json=body)
-        response.raise_for_status()
-        response_data = response.json()
+        if self.cache:
+            cached = self.cache.get(text, self.backend.voice_name, self.WAV_ENCODING)
+            if cached is not None:
+                return base64.b64encode(cached).decode()
+
+        wav_bytes = self.policy.call(self.backend.synthesize_wav, text)
+        if not wav_bytes:
+            return None
+        if self.cache:
+            self.cache.put(text, self.backend.voice_name, self.WAV_ENCODING, wav_bytes)
+        return base64.b64encode(wav_bytes).decode()
 
-        audio_base64 = response_data.get("audioContent")
-        return audio_base64
-    
     def get_audio_duration(self, audio_base64):
         """Get duration of base64 encoded audio"""
         try:
-            import io
-            
+            import soundfile as sf  # only needed here, keep it off the startup path
+
             # Decode base64 to bytes
             audio_bytes = base64.b64decode(audio_base64)
             
@@ -83,35 +110,57 @@ class TTSManager():
             print(f"Error getting audio duration: {e}")
             return 0.0
 
-    def synthesize_speech_streaming(self, text):
-        """Generator that yields real-time audio chunks from Google TTS streaming"""
-        try:            
-            def request_generator(): # Create requests iterator
-                # first request with config
-                yield texttospeech.StreamingSynthesizeRequest(
-                    streaming_config=self.streaming_config
-                )
-                # second request with input
-                yield texttospeech.StreamingSynthesizeRequest(
-                    input=texttospeech.StreamingSynthesisInput(text=text)
-                )
-            
-            streaming_response = self.grpc_client.streaming_synthesize(request_generator())
-            
-            chunk_count = 0
-            for response in streaming_response: # yield audio chunks as they arrive
-                if response.audio_content:
-                    chunk_count += 1
-                    print(f"Streaming TTS: Got chunk {chunk_count}, size: {len(response.audio_content)} bytes")
-                    audio_base64 = base64.b64encode(response.audio_content).decode()  # convert to base64 for web transmission
-                    yield audio_base64
-            
-            print(f"Streaming TTS completed with {chunk_count} chunks")
-                    
+    def synthesize_speech_streaming(self, text, turn=None):
+        """Generator that yields real-time base64 audio chunks (for JSON/SSE transport)"""
+        for chunk in self.synthesize_speech_streaming_pcm(text, turn=turn):
+            yield base64.b64encode(chunk).decode()  # convert to base64 for web transmission
+
+    def synthesize_speech_streaming_pcm(self, text, turn=None):
+        """
+        Generator that yields raw 24kHz 16-bit PCM chunks (bytes or memoryview) as they arrive, no re-encoding.
+        Phrase bank first, then the cache, then the backend. Cancelling `turn` aborts the backend stream.
+        If the stream can't be started (deadline, errors, open circuit) the whole sentence is synthesized
+        in one request instead; if that fails too the sentence is skipped rather than failing the turn.
+        """
+        if self.phrase_bank:
+            banked = self.phrase_bank.get(text)
+            if banked is not None:
+                yield from AudioCache.iter_chunks(banked)
+                return
+
+        if self.cache:
+            cached = self.cache.get(text, self.backend.voice_name, self.PCM_ENCODING)
+            if cached is not None:
+                # replay cached audio as a chunked stream so the streaming path is unchanged
+                yield from AudioCache.iter_chunks(cached)
+                return
+
+        audio_parts = []
+        try:
+            for chunk in self.policy.stream(lambda: self.backend.stream_pcm(text, turn=turn), fallback=lambda: self._whole_pcm(text)):
+                audio_parts.append(chunk)
+                yield chunk
         except Exception as e:
-            print(f"Error in streaming TTS: {e}")
-            print("Falling back to non-streaming TTS")
-            # Fallback to non-streaming
-            full_audio = self.synthesize_speech(text)
-            print(f"Fallback TTS generated audio of length: {len(full_audio) if full_audio else 0}")
-            yield full_audio
\ No newline at end of file
+            if not (turn and turn.cancelled):
+                print(f"TTS failed, skipping sentence: {e}")
+            return  # partial audio isn't cached
+
+        if self.cache and audio_parts and not (turn and turn.cancelled):
+            self.cache.put(text, self.backend.voice_name, self.PCM_ENCODING, b"".join(audio_parts))
+
+    def _whole_pcm(self, text):
+        """Non-streaming synthesis as a one-chunk stream"""
+        wav_bytes = self.backend.synthesize_wav(text)
+        return [TTSBackend.wav_to_pcm(wav_bytes)] if wav_bytes else []
+
+    @staticmethod
+    def wav_to_pcm(wav_bytes):
+        """Raw PCM frames of a WAV file"""
+        return TTSBackend.wav_to_pcm(wav_bytes)
+
+    def stats(self):
+        return {
+            "provider": self.policy.stats(),
+            "cache": self.cache.stats() if self.cache else None,
+            "phrase_bank": self.phrase_bank.stats() if self.phrase_bank else None,
+        }
@@ -1,25 +1,38 @@
-from google.cloud import translate_v2 as translate
 import os
-from google.oauth2 import service_account
 import html
+from src.core.WorkerPool import WorkerPool
+from src.core.ResilientCaller import ResilientCaller
+from src.core.TranslationCache import TranslationCache
+from src.core.WordTokenizer import WordTokenizer
+from src.core.GoogleClients import GoogleClients
 
 class Translator:
-    def __init__(self, google_credentials_path: str = "C:/Users/Willo/Documents/projects/SpanishTutor/google_credentials.json"):
+    def __init__(self, google_credentials_path: str = "C:/Users/Willo/Documents/projects/SpanishTutor/google_credentials.json", cache_path: str = None, clients: GoogleClients = None, policy: ResilientCaller = None):
         self.google_credentials_path = google_credentials_path
+        self.cache = TranslationCache(cache_path) if cache_path else None
+        self.policy = policy or ResilientCaller("translate")
         
-        # Initialize with service account credentials
-        credentials = service_account.Credentials.from_service_account_file(
-            google_credentials_path
-        )
-        self.translate_client = translate.Client(credentials=credentials)
+        # Initialize with the shared service account credentials
+        self.clients = clients or GoogleClients(google_credentials_path)
+        self.translate_client = self.clients.translate_client()
+
+    def warm_up(self):
+        """Cheap request that opens the connection ahead of the first translation"""
+        self.translate_client.get_languages()
 
     def translate_text(self, text, source_language="es", target_language="en"):
         """
         Translate full text from Spanish to English (or vice versa)
         """
         try:
-            result = self.translate_client.translate(
-                text, 
+            if self.cache:
+                cached = self.cache.get(text, source_language, target_language)
+                if cached is not None:
+                    return cached
+
+            result = self.policy.call(
+                self.translate_client.translate,
+                text,
                 source_language=source_language,
                 target_language=target_language
             )
@@ -27,37 +40,70 @@ class Translator:
             
             # Decode HTML entities (&#39; -> ', &quot; -> ", etc.)
             decoded = html.unescape(translated)
+            if self.cache:
+                self.cache.put(text, source_language, target_language, decoded)
             return decoded
             
         except Exception as e:
             print(f"Translation error: {e}")
             return text
 
-    def translate_word_by_word(self, sentence, target_language="en"):
+    # Google Translate v2 limits per request
+    MAX_BATCH_SEGMENTS = 128
+    MAX_BATCH_CHARS = 5000
+
+    def translate_word_by_word(self, sentence, target_language="en", source_language=None):
+        """
+        Translate each word individually (rough approximation), returns {word: translation}
+        """
+        return {entry["word"]: entry["translation"] for entry in self.translate_words_batch([sentence], source_language, target_language)[0]}
+
+    def translate_words_batch(self, sentences, source_language=None, target_language="en"):
         """
-        Translate each word individually (rough approximation)
+        Word-by-word translation of many sentences at once (a whole turn, or the conversation so far).
+        Each distinct word is translated once across all sentences, uncached words go out in as few
+        requests as the API limits allow, sent concurrently. Returns one list per sentence of
+        {"word", "start", "end", "translation"}, aligned with the words of that sentence.
         """
+        tokenized = [WordTokenizer.tokenize(sentence) for sentence in sentences]
+        keys = WordTokenizer.unique_keys(tokenized)
+        source_key = source_language or "auto"  # cache slot for auto-detected source
+
+        translations = self.cache.get_many(keys, source_key, target_language) if self.cache and keys else {}
+        unseen = [key for key in keys if key not in translations]
+        if unseen:
+            futures = [WorkerPool.submit(self._translate_batch, chunk, source_language, target_language) for chunk in self._chunk(unseen)]
+            new_translations = {}
+            for future in futures:
+                new_translations.update(future.result())
+            if self.cache and new_translations:
+                self.cache.put_many(new_translations, source_key, target_language)
+            translations.update(new_translations)
+
+        return [
+            [{"word": token.word, "start": token.start, "end": token.end, "translation": translations.get(token.key)} for token in tokens]
+            for tokens in tokenized
+        ]
+
+    def _chunk(self, words):
+        """Split into request-sized batches, by segment count and total characters"""
+        chunk, chars = [], 0
+        for word in words:
+            if chunk and (len(chunk) >= self.MAX_BATCH_SEGMENTS or chars + len(word) > self.MAX_BATCH_CHARS):
+                yield chunk
+                chunk, chars = [], 0
+            chunk.append(word)
+            chars += len(word)
+        if chunk:
+            yield chunk
+
+    def _translate_batch(self, words, source_language, target_language):
+        """One API request for a batch of words, returns {word: translation} (empty if the request failed)"""
         try:
-            # Simple word splitting (not perfect for punctuation)
-            words = sentence.replace("¿", "").replace("?", "").replace("¡", "").replace("!", "").split()
-            
-            if not words:
-                return {}
-            
-            # Translate all words at once for efficiency
-            translations = self.translate_client.translate(words, target_language=target_language)
-            
-            # Create word-to-translation mapping
-            word_translations = {}
-            for i, word in enumerate(words):
-                if isinstance(translations, list):
-                    word_translations[word] = translations[i]["translatedText"]
-                else:
-                    # Single word case
-                    word_translations[word] = translations["translatedText"]
-                    
-            return word_translations
-            
+            results = self.policy.call(self.translate_client.translate, words, source_language=source_language, target_language=target_language, format_="text", operation="words")
+            if not isinstance(results, list):
+                results = [results]  # single value in, single dict out
+            return {word: html.unescape(result["translatedText"]) for word, result in zip(words, results)}
         except Exception as e:
             print(f"Word-by-word translation error: {e}")
             return {}
@@ -72,8 +118,11 @@ class Translator:
     
     def word_by_word_es_to_en(self, sentence):
         """Spanish sentence word-by-word to English"""
-        return self.translate_word_by_word(sentence, target_language="en")
+        return self.translate_word_by_word(sentence, target_language="en", source_language="es")
     
     def word_by_word_en_to_es(self, sentence):
         """English sentence word-by-word to Spanish"""
-        return self.translate_word_by_word(sentence, target_language="es")
\ No newline at end of file
+        return self.translate_word_by_word(sentence, target_language="es", source_language="en")
+
+    def stats(self):
+        return {"provider": self.policy.stats(), "cache": self.cache.stats() if self.cache else None}
\ No newline at end of file
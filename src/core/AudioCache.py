@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+class AudioCache:
+    """
+    Content-addressed on-disk cache of synthesized audio, keyed by (text, voice, encoding).
+    Audio is stored as raw bytes (PCM or WAV, whatever the provider returned) and the
+    least recently used files are evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir="cache/tts", max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        # rebuild the index from disk, oldest access first
+        files = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".audio"):
+                stat = os.stat(os.path.join(cache_dir, name))
+                files.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def make_key(text, voice, encoding):
+        return hashlib.sha256(f"{voice}\0{encoding}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.audio")
+
+    def contains(self, text, voice, encoding):
+        """Whether this audio is cached, without counting a hit or miss or touching recency"""
+        with self.lock:
+            return self.make_key(text, voice, encoding) in self.entries
+
+    def get(self, text, voice, encoding):
+        """Return the cached audio bytes, or None on a miss."""
+        key = self.make_key(text, voice, encoding)
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key))  # persist recency for the next startup
+        except OSError:
+            with self.lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return audio
+
+    def put(self, text, voice, encoding, audio):
+        if not audio or len(audio) > self.max_bytes:
+            return
+        key = self.make_key(text, voice, encoding)
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._path(key))  # atomic, readers never see a partial file
+        except OSError as e:
+            print(f"Could not write TTS cache entry: {e}")
+            return
+        with self.lock:
+            self._forget(key)
+            self.entries[key] = len(audio)
+            self.total_bytes += len(audio)
+            while self.total_bytes > self.max_bytes:
+                oldest = next(iter(self.entries))
+                self._forget(oldest)
+                try:
+                    os.unlink(self._path(oldest))
+                except OSError:
+                    pass
+
+    def _forget(self, key):
+        size = self.entries.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+
+    @staticmethod
+    def iter_chunks(audio, chunk_size=9600):
+        """Replay cached audio as a chunked stream (default ~200ms of 24kHz 16-bit mono)."""
+        view = memoryview(audio)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "total_bytes": self.total_bytes,
+            }
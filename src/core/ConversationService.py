@@ -1,30 +1,113 @@
 import os
-import subprocess
 import time
-from src.STTManager import STTManager
+from concurrent.futures import Future
+from src.core.HistorySummarizer import HistorySummarizer
 from src.core.MemoryState import MemoryState
+from src.core.SessionManager import SessionManager
 from src.Utils import Utils
-from src.TTSManager import TTSManager
 
 class ConversationService:
 
     def __init__(self, llm = None, stt = None, tts = None, translator = None, config = None, selected_scenario = None):
-        self.llm = llm
+        # backends may be Futures still initializing in the background (see ServiceReadiness),
+        # the first request that needs one waits for it
+        self._llm = llm
         self.config = config
-        self.stt = stt
-        self.tts = tts
-        self.translator = translator
-        self.memory = MemoryState(self.config["system_prompt"])
+        self._stt = stt
+        self._tts = tts
+        self._translator = translator
+        self.selected_scenario = selected_scenario
         if selected_scenario in self.config["roleplay_scenarios"]:
             scenario_data = self.config["roleplay_scenarios"][selected_scenario]
-            self.memory.set_roleplay_scenario(scenario_data["prompt"])
             print(f"Scenario set to: {scenario_data['name']} ({scenario_data['difficulty']})")
         else:
             print(f"Invalid scenario: {selected_scenario}")
+        store, writer = self._build_session_store()
+        self.sessions = SessionManager(
+            self._create_memory,
+            max_sessions=self.config.get("max_sessions", 256),
+            ttl_seconds=self.config.get("session_ttl_seconds", 3600),
+            store=store,
+            writer=writer
+        )
+        summary_config = self.config.get("history_summary", {})
+        self.summarizer = None
+        if summary_config.get("enabled", False):
+            self.summarizer = HistorySummarizer(
+                lambda: self.llm,
+                trigger_tokens=summary_config.get("trigger_tokens", 1800),
+                keep_exchanges=summary_config.get("keep_exchanges", 4),
+                max_words=summary_config.get("max_words", 120),
+                prompt=summary_config.get("prompt"),
+                on_summary=self.sessions.mark_dirty,
+            )
+
+    def _build_session_store(self):
+        """Persistent session store from config["session_store"], (None, None) to keep sessions in memory only."""
+        store_config = self.config.get("session_store", {})
+        backend = store_config.get("backend", "none")
+        if backend == "none":
+            return None, None
+        if backend != "sqlite":
+            raise ValueError(f"Unknown session store backend: {backend}")
+        from src.core.SqliteSessionStore import SqliteSessionStore
+        from src.core.SessionWriter import SessionWriter
+        store = SqliteSessionStore(store_config.get("path", "cache/sessions.sqlite3"), ttl_seconds=self.config.get("session_ttl_seconds", 3600))
+        writer = SessionWriter(store, flush_interval=store_config.get("flush_interval_ms", 500) / 1000, max_batch=store_config.get("max_batch", 256))
+        return store, writer
+
+    @staticmethod
+    def _resolve(backend):
+        return backend.result() if isinstance(backend, Future) else backend
+
+    @property
+    def llm(self):
+        return self._resolve(self._llm)
+
+    @property
+    def stt(self):
+        return self._resolve(self._stt)
+
+    @property
+    def tts(self):
+        return self._resolve(self._tts)
+
+    @property
+    def translator(self):
+        return self._resolve(self._translator)
+
+    def component_stats(self):
+        """stats() of each manager, None for one still loading (or missing), so /metrics never waits on startup"""
+        stats = {}
+        for name, backend in (("llm", self._llm), ("stt", self._stt), ("tts", self._tts), ("translation", self._translator)):
+            if isinstance(backend, Future):
+                if not backend.done() or backend.exception() is not None:
+                    stats[name] = None
+                    continue
+                backend = backend.result()
+            stats[name] = backend.stats() if backend is not None else None
+        return stats
+
+    def _create_memory(self):
+        """Fresh conversation memory for a new learner session."""
+        memory = MemoryState(self.config["system_prompt"], max_history_tokens=self.config.get("max_history_tokens", 3000))
+        if self.selected_scenario in self.config["roleplay_scenarios"]:
+            memory.set_roleplay_scenario(self.config["roleplay_scenarios"][self.selected_scenario]["prompt"])
+        return memory
+
+    def get_session(self, session_id):
+        return self.sessions.get(session_id)
+
+    def remember_exchange(self, session, user_message, response):
+        """Add a finished exchange to the session's memory, older ones get summarized in the background."""
+        with session.lock:
+            session.memory.add_exchange(user_message, response)
+        self.sessions.mark_dirty(session)
+        if self.summarizer:
+            self.summarizer.maybe_summarize(session)
         
     def get_voice_input(self):
-        while self.tts.is_playing:
-            time.sleep(0.1)
+        self.tts.playback_idle.wait()
         audio_file = self.stt.record_audio(duration=8)
         
         if audio_file:
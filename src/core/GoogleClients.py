@@ -0,0 +1,81 @@
+import datetime
+import threading
+import google.auth.transport.requests
+import requests
+from requests.adapters import HTTPAdapter
+from google.oauth2 import service_account
+
+class GoogleClients:
+    """
+    One set of Google Cloud credentials shared by TTSManager and Translator, with a
+    pooled keep-alive HTTP session, proactive background token refresh and a single
+    gRPC TTS client (and channel) reused by every request.
+    """
+
+    SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+    def __init__(self, google_credentials_path: str, refresh_margin_seconds: int = 300, pool_size: int = 32):
+        self.google_credentials_path = google_credentials_path
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.credentials = service_account.Credentials.from_service_account_file(
+            google_credentials_path, scopes=self.SCOPES
+        )
+
+        # keep-alive connection pool, so TLS handshakes stay off the hot path
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.auth_request = google.auth.transport.requests.Request(session=self.session)
+
+        self.lock = threading.Lock()
+        self._tts_client = None
+        self.refresh()
+
+        self.stopped = threading.Event()
+        self.refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self.refresh_thread.start()
+
+    def refresh(self):
+        with self.lock:
+            self.credentials.refresh(self.auth_request)
+
+    def access_token(self):
+        """Current bearer token, refreshed on the spot if the background refresh fell behind"""
+        with self.lock:
+            if not self.credentials.valid or self._seconds_until_expiry() < self.refresh_margin_seconds / 2:
+                self.credentials.refresh(self.auth_request)
+            return self.credentials.token
+
+    def _seconds_until_expiry(self):
+        if not self.credentials.expiry:
+            return 0
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)  # google-auth uses naive UTC
+        return (self.credentials.expiry - now).total_seconds()
+
+    def _refresh_loop(self):
+        while True:
+            wait = max(5, self._seconds_until_expiry() - self.refresh_margin_seconds)
+            if self.stopped.wait(wait):
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Google token refresh failed, retrying: {e}")
+                if self.stopped.wait(10):
+                    return
+
+    def tts_client(self):
+        """Shared gRPC TextToSpeechClient, built once so its channel is reused"""
+        with self.lock:
+            if self._tts_client is None:
+                from google.cloud import texttospeech
+                self._tts_client = texttospeech.TextToSpeechClient(credentials=self.credentials)
+            return self._tts_client
+
+    def translate_client(self):
+        from google.cloud import translate_v2 as translate
+        return translate.Client(credentials=self.credentials)
+
+    def close(self):
+        self.stopped.set()
+        self.session.close()
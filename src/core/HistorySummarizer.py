@@ -0,0 +1,92 @@
+import threading
+import time
+from src.core.WorkerPool import WorkerPool
+
+class HistorySummarizer:
+    """
+    Rolling summary of a session's older exchanges, so hour-long conversations keep a roughly
+    constant prompt size without the tutor forgetting how the learner is doing.
+    Once a MemoryState's history passes `trigger_tokens`, everything but the latest
+    `keep_exchanges` is folded, together with the previous summary, into a short learner
+    profile by one LLM call on the WorkerPool. The turn that crossed the threshold never waits
+    for it; the summary replaces those exchanges whenever it lands.
+    """
+
+    DEFAULT_PROMPT = (
+        "You keep notes for a Spanish tutor. Update the learner profile from the previous profile and the "
+        "conversation below. Cover their Spanish level, recurring mistakes, vocabulary and grammar they "
+        "have practiced, topics discussed and anything they asked for. Plain text, at most {max_words} words."
+    )
+
+    def __init__(self, get_llm, trigger_tokens=1800, keep_exchanges=4, max_words=120, prompt=None, on_summary=None):
+        self.get_llm = get_llm  # called on the worker thread, the LLM may still be initializing at startup
+        self.on_summary = on_summary  # called with the session once its summary is in, e.g. to persist it
+        self.trigger_tokens = trigger_tokens
+        self.keep_exchanges = keep_exchanges
+        self.prompt = (prompt or self.DEFAULT_PROMPT).format(max_words=max_words)
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.failures = 0
+        self.exchanges_summarized = 0
+        self.total_ms = 0.0
+
+    def maybe_summarize(self, session):
+        """Schedule a summary for this session's memory if it has grown past the threshold. Never blocks."""
+        with session.lock:
+            memory = session.memory
+            if memory.summarizing or memory.history_tokens < self.trigger_tokens:
+                return None
+            exchanges = memory.exchanges_to_summarize(self.keep_exchanges)
+            if not exchanges:
+                return None
+            memory.summarizing = True
+            previous_summary = memory.summary
+            generation = memory.generation
+        return WorkerPool.submit(self._summarize, session, exchanges, previous_summary, generation)
+
+    def _summarize(self, session, exchanges, previous_summary, generation):
+        start_time = time.time()
+        try:
+            summary = self.get_llm().ask_messages(self.build_messages(exchanges, previous_summary))
+        except Exception as e:
+            print(f"History summary failed: {e}")
+            with self.lock:
+                self.failures += 1
+            with session.lock:
+                session.memory.summarizing = False
+            return None
+
+        with session.lock:
+            memory = session.memory
+            memory.summarizing = False
+            applied = memory.apply_summary(summary, exchanges, generation)
+        elapsed_ms = (time.time() - start_time) * 1000
+        if applied:
+            with self.lock:
+                self.runs += 1
+                self.exchanges_summarized += len(exchanges)
+                self.total_ms += elapsed_ms
+            print(f"Summarized {len(exchanges)} exchanges in {elapsed_ms:.1f}ms")
+            if self.on_summary:
+                self.on_summary(session)
+            self.maybe_summarize(session)  # turns that finished meanwhile may already be past the threshold again
+        return summary
+
+    def build_messages(self, exchanges, previous_summary=""):
+        lines = [f"Previous profile:\n{previous_summary or '(none yet)'}", "", "Conversation:"]
+        for user_msg, assistant_msg in exchanges:
+            lines.append(f"Learner: {user_msg}")
+            lines.append(f"Tutor: {assistant_msg}")
+        return [
+            {"role": "system", "content": self.prompt},
+            {"role": "user", "content": "\n".join(lines)},
+        ]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "runs": self.runs,
+                "failures": self.failures,
+                "exchanges_summarized": self.exchanges_summarized,
+                "mean_ms": self.total_ms / self.runs if self.runs else 0.0,
+            }
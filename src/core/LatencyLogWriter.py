@@ -0,0 +1,69 @@
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+
+class LatencyLogWriter:
+    """
+    Appends per-turn latency rows to a CSV file from a background thread, in batches,
+    so request threads never touch the disk.
+    """
+
+    def __init__(self, filepath, columns, flush_interval=1.0, max_pending=10000):
+        self.filepath = filepath
+        self.columns = list(columns)
+        self.flush_interval = flush_interval
+        self.rows = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self._run, name="latency-log", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, row):
+        """Queue a row (dict keyed by column), dropped rather than blocking if the writer falls behind."""
+        try:
+            self.rows.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            # wait for a row, then keep collecting for up to flush_interval and write them with one open
+            batch = [self.rows.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.rows.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            closing = batch[-1] is None
+            self._append([row for row in batch if row is not None])
+            if closing:
+                return
+
+    def _append(self, rows):
+        if not rows:
+            return
+        try:
+            file_exists = os.path.exists(self.filepath)
+            with open(self.filepath, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.columns, extrasaction='ignore')
+                if not file_exists:
+                    writer.writeheader()
+                writer.writerows(rows)
+        except OSError as e:
+            print(f"Latency log write failed: {e}")
+
+    def close(self):
+        """Flush pending rows and stop the writer thread."""
+        if self.thread.is_alive():
+            self.rows.put(None)
+            self.thread.join(timeout=5)
@@ -0,0 +1,50 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+class LatencyTrace:
+    """Span timings for one conversation turn, all in milliseconds."""
+
+    # durations, summed if a span happens more than once in a turn (e.g. TTS per sentence)
+    SPANS = ("upload", "stt", "llm_first_token", "llm", "tts_first_chunk", "tts", "translation", "flush")
+    # offsets from the start of the turn
+    MARKS = ("first_audio", "total")
+
+    def __init__(self, kind, start_time=None):
+        self.kind = kind  # "stream", "voice" or "text"
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.timestamp = datetime.now().isoformat()
+        self.spans = {}
+        self.marks = {}
+
+    def add(self, name, ms):
+        self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def mark(self, name):
+        """Record the time since the start of the turn, only the first call per name counts."""
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.start_time) * 1000
+
+    def timings(self):
+        return {**self.spans, **self.marks}
+
+    @classmethod
+    def columns(cls, *extra):
+        """Latency log columns, `extra` goes between the turn kind and the span timings."""
+        return ["timestamp", "kind", *extra] + [f"{name}_ms" for name in cls.SPANS + cls.MARKS]
+
+    def as_row(self, **extra):
+        """Flat dict for the latency log, every span column present."""
+        row = {"timestamp": self.timestamp, "kind": self.kind, **extra}
+        for name in self.SPANS + self.MARKS:
+            value = self.spans.get(name, self.marks.get(name))
+            row[f"{name}_ms"] = round(value, 1) if value is not None else ""
+        return row
@@ -1,38 +1,110 @@
-class MemoryState: # TODO: This could definitely be optimized
+from collections import deque
 
-    def __init__(self, system_prompt="", roleplay_scenario="", max_exchanges=32):
+class MemoryState:
+
+    CHARS_PER_TOKEN = 4  # rough estimate, good enough for budgeting Spanish/English text
+    MESSAGE_OVERHEAD_TOKENS = 4  # role markers the provider adds around each message
+
+    def __init__(self, system_prompt="", roleplay_scenario="", max_history_tokens=3000, max_exchanges=None):
         self.system_prompt = system_prompt
         self.roleplay_scenario = roleplay_scenario
-        self.history = []
-        self.max_exchanges = max_exchanges
+        self.max_history_tokens = max_history_tokens
+        self.max_exchanges = max_exchanges  # optional hard cap on top of the token budget
+        self.history = deque()  # (user_msg, assistant_msg)
+        self.messages = deque()  # pre-built chat messages, two per exchange in history
+        self.segment_tokens = deque()  # cached token estimate for each exchange
+        self.history_tokens = 0
+        self.summary = ""  # learner profile compacted from exchanges that left the history (see HistorySummarizer)
+        self.summary_message = None
+        self.summarizing = False  # a summary job for this memory is in flight
+        self.generation = 0  # bumped by clear_memory, a summary of the old conversation is then discarded
+        self._build_system_message()
+
+    def _build_system_message(self):
+        # Built once and reused as-is so the prefix sent each turn stays byte-identical
+        # and the provider's prompt-prefix cache can kick in
+        content = self.system_prompt
+        if self.roleplay_scenario:
+            content = f"{content}\n\n{self.roleplay_scenario}" if content else self.roleplay_scenario
+        self.system_message = {"role": "system", "content": content} if content else None
+
+    @classmethod
+    def estimate_tokens(cls, text):
+        return len(text) // cls.CHARS_PER_TOKEN + 1
 
     def set_roleplay_scenario(self, scenario_prompt):
         self.roleplay_scenario = scenario_prompt
-    
+        self._build_system_message()
+
     def add_exchange(self, user_msg, assistant_msg):
+        tokens = self.estimate_tokens(user_msg) + self.estimate_tokens(assistant_msg) + 2 * self.MESSAGE_OVERHEAD_TOKENS
         self.history.append((user_msg, assistant_msg))
-        if len(self.history) > self.max_exchanges:
-            self.history.pop(0)
-    
-    def build_prompt(self, new_msg):
-        prompt = ""
-        
-        # Include system prompt if first message
-        if not self.history and self.system_prompt:
-            prompt = f"<start_of_turn>user\n{self.system_prompt}\n\n"
-            if self.roleplay_scenario:
-                prompt += f"{self.roleplay_scenario}\n\n"  # Add scenario prompt
-            prompt += f"{new_msg}<end_of_turn>\n<start_of_turn>model\n"
-        else:
-            # add past exchanges
-            for user_msg, assistant_msg in self.history:
-                prompt += f"<start_of_turn>user\n{user_msg}<end_of_turn>\n"
-                prompt += f"<start_of_turn>model\n{assistant_msg}<end_of_turn>\n"
-            
-            # add the new user message
-            prompt += f"<start_of_turn>user\n{new_msg}<end_of_turn>\n<start_of_turn>model\n"
-        
-        return prompt
+        self.messages.append({"role": "user", "content": user_msg})
+        self.messages.append({"role": "assistant", "content": assistant_msg})
+        self.segment_tokens.append(tokens)
+        self.history_tokens += tokens
+        self._trim()
+
+    def _trim(self):
+        """Drop the oldest exchanges until the history fits the budget (always keeps the latest one)."""
+        while len(self.history) > 1 and (
+            self.history_tokens > self.max_history_tokens
+            or (self.max_exchanges and len(self.history) > self.max_exchanges)
+        ):
+            self._pop_oldest()
+
+    def _pop_oldest(self):
+        self.history.popleft()
+        self.messages.popleft()
+        self.messages.popleft()
+        self.history_tokens -= self.segment_tokens.popleft()
+
+    def exchanges_to_summarize(self, keep_exchanges):
+        """The oldest exchanges, everything except the latest `keep_exchanges`, oldest first."""
+        return list(self.history)[:max(0, len(self.history) - keep_exchanges)]
+
+    def apply_summary(self, summary, exchanges, generation):
+        """
+        Replace the summarized `exchanges` with `summary`. The history may have moved on while
+        the summary was being written, so only those exchanges still at the front are dropped.
+        """
+        if generation != self.generation:
+            return False
+        summarized = set(map(id, exchanges))
+        while self.history and id(self.history[0]) in summarized:
+            self._pop_oldest()
+        self._set_summary(summary)
+        return True
+
+    def _set_summary(self, summary):
+        self.summary = summary
+        self.summary_message = {"role": "system", "content": f"What you know about this learner from earlier in the conversation:\n{summary}"} if summary else None
+
+    def to_record(self):
+        """The learner-specific state, for a SessionStore (the prompts come from config on restore)."""
+        return {"history": [list(exchange) for exchange in self.history], "summary": self.summary}
+
+    def restore(self, record):
+        """Load a record written by to_record, trimmed to this memory's budget. Replaces the current history."""
+        self.clear_memory()  # also invalidates a summary still in flight for the old history
+        for user_msg, assistant_msg in record.get("history", []):
+            self.add_exchange(user_msg, assistant_msg)
+        self._set_summary(record.get("summary", ""))
+
+    def build_messages(self, new_msg):
+        """Chat messages for the next turn: stable system prefix, learner summary, past exchanges, then the new message."""
+        messages = [self.system_message] if self.system_message else []
+        if self.summary_message:
+            messages.append(self.summary_message)  # after the system prompt, so the cached prefix is unchanged
+        messages.extend(self.messages)
+        messages.append({"role": "user", "content": new_msg})
+        return messages
 
     def clear_memory(self):
-        self.history = []
\ No newline at end of file
+        self.history.clear()
+        self.messages.clear()
+        self.segment_tokens.clear()
+        self.history_tokens = 0
+        self.summary = ""
+        self.summary_message = None
+        self.generation += 1
@@ -0,0 +1,79 @@
+import bisect
+import threading
+
+class Histogram:
+    """Fixed-bucket latency histogram (ms), cheap enough to update on every turn."""
+
+    BUCKETS_MS = (5, 10, 25, 50, 75, 100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 20000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)  # last bucket is +inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (capped at the observed max)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                bound = self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": round(self.percentile(0.95), 1),
+            "p99": round(self.percentile(0.99), 1),
+            "max": round(self.max, 1),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.BUCKETS_MS, self.counts)},
+                "le_inf": self.counts[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """In-process latency histograms per span, plus plain counters, served by /metrics."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # "stream.stt" -> Histogram
+        self.counters = {}
+
+    def observe(self, name, ms):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_trace(self, trace):
+        """Feed every span of a finished LatencyTrace into the histograms, keyed by turn kind."""
+        for name, ms in trace.timings().items():
+            self.observe(f"{trace.kind}.{name}", ms)
+        self.increment(f"{trace.kind}.turns")
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "histograms": {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+                "counters": dict(self.counters),
+            }
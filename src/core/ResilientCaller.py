@@ -0,0 +1,242 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from src.core.CircuitBreaker import CircuitBreaker
+from src.core.MetricsRegistry import Histogram, MetricsRegistry
+
+class ProviderUnavailable(Exception):
+    """The provider's circuit is open and the call has no fallback."""
+
+
+class ResilientCaller:
+    """
+    Call policy for one provider (llm, stt, tts, translate): every attempt gets a deadline,
+    failed attempts are retried after a jittered backoff, a duplicate request is sent once an
+    attempt runs past the provider's observed latency percentile (hedging, first answer wins),
+    and a circuit breaker sends calls straight to the fallback while the provider is failing.
+    Latency is tracked per operation ("call", "stream" time to first item, or a caller-chosen
+    name), so each hedge delay comes from requests of the same shape.
+    Outcomes are counted in the MetricsRegistry as "provider.<name>.<outcome>".
+
+    Attempts run on a dedicated pool, not the WorkerPool, since callers are often WorkerPool
+    tasks themselves. A timed-out or losing attempt can't be interrupted, it finishes in the
+    background, so the SDK clients should also have their own timeouts.
+    """
+
+    _executor = None
+    _max_workers = 64
+    _lock = threading.Lock()
+
+    MIN_HEDGE_SAMPLES = 20  # latencies observed before the percentile is trusted
+
+    def __init__(self, name, timeout_s=30.0, retries=1, backoff_ms=200, hedge_percentile=None, hedge_min_ms=200,
+                 failure_threshold=5, reset_after_s=30.0, metrics=None):
+        self.name = name
+        self.timeout_s = timeout_s  # per attempt, for streams the time to the first item
+        self.retries = retries
+        self.backoff_ms = backoff_ms
+        self.hedge_percentile = hedge_percentile  # e.g. 0.95, None disables hedging
+        self.hedge_min_ms = hedge_min_ms
+        self.breaker = CircuitBreaker(failure_threshold, reset_after_s)
+        self.metrics = metrics or MetricsRegistry()
+        self.latency = {}  # operation -> Histogram of successful attempts, drives that operation's hedge delay
+        self.latency_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, name, config, metrics=None):
+        """Policy from config["resilience"][name], defaults for anything missing"""
+        return cls(name, metrics=metrics, **config.get("resilience", {}).get(name, {}))
+
+    @classmethod
+    def configure(cls, max_workers):
+        """Set the attempt pool size, must be called before the first call."""
+        with cls._lock:
+            if cls._executor is not None:
+                raise RuntimeError("ResilientCaller pool already started")
+            cls._max_workers = max_workers
+
+    @classmethod
+    def _submit(cls, fn, *args, **kwargs):
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(max_workers=cls._max_workers, thread_name_prefix="provider")
+        return cls._executor.submit(fn, *args, **kwargs)
+
+    def _count(self, outcome):
+        self.metrics.increment(f"provider.{self.name}.{outcome}")
+
+    def _observe(self, operation, ms):
+        with self.latency_lock:
+            histogram = self.latency.get(operation)
+            if histogram is None:
+                histogram = self.latency[operation] = Histogram()
+            histogram.observe(ms)
+        self.metrics.observe(f"provider.{self.name}" if operation == "call" else f"provider.{self.name}.{operation}", ms)
+
+    def hedge_delay_s(self, operation="call"):
+        """How long an attempt may run before a duplicate is sent, None if hedging is off or there's no baseline yet"""
+        if self.hedge_percentile is None:
+            return None
+        with self.latency_lock:
+            histogram = self.latency.get(operation)
+            if histogram is None or histogram.count < self.MIN_HEDGE_SAMPLES:
+                return None
+            threshold_ms = histogram.percentile(self.hedge_percentile)
+        return max(threshold_ms, self.hedge_min_ms) / 1000
+
+    def _backoff(self, attempt):
+        # full jitter, so callers that failed together don't retry together
+        time.sleep(random.uniform(0, self.backoff_ms * 2 ** (attempt - 1)) / 1000)
+
+    def call(self, fn, *args, fallback=None, operation="call", **kwargs):
+        """
+        fn(*args, **kwargs) under this policy, `fallback()` if the provider is unavailable.
+        `operation` names the latency baseline, give requests of a different size their own (e.g. batches).
+        """
+        if not self.breaker.allow():
+            self._count("circuit_open")
+            return self._fallback(fallback)
+
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retry")
+                self._backoff(attempt)
+            try:
+                result = self._attempt(operation, fn, args, kwargs)
+            except Exception as e:
+                error = e
+                self._count("timeout" if isinstance(e, TimeoutError) else "error")
+                if self.breaker.record_failure():
+                    print(f"{self.name}: circuit opened after repeated failures ({e})")
+                    break
+                continue
+            self.breaker.record_success()
+            return result
+
+        if fallback is None:
+            raise error
+        print(f"{self.name}: giving up on the provider ({error}), using the fallback")
+        return self._fallback(fallback)
+
+    def _hedge_at(self, operation, start):
+        hedge_delay = self.hedge_delay_s(operation)
+        if hedge_delay is not None and hedge_delay < self.timeout_s:
+            return start + hedge_delay
+        return None
+
+    def _attempt(self, operation, fn, args, kwargs):
+        """One logical attempt: the request plus at most one hedged duplicate, within one deadline"""
+        start = time.monotonic()
+        deadline = start + self.timeout_s
+        hedge_at = self._hedge_at(operation, start)
+
+        futures = {self._submit(fn, *args, **kwargs): False}  # future -> is the hedge
+        error = None
+        while futures:
+            now = time.monotonic()
+            wake_at = min(deadline, hedge_at) if hedge_at else deadline
+            done, _ = wait(futures, timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                hedged = futures.pop(future)
+                if future.exception() is None:
+                    self._observe(operation, (time.monotonic() - start) * 1000)
+                    self._count("hedge_won" if hedged else "success")
+                    return future.result()
+                error = future.exception()
+            now = time.monotonic()
+            if now >= deadline:
+                raise TimeoutError(f"{self.name} did not answer within {self.timeout_s}s")
+            if hedge_at and now >= hedge_at:
+                hedge_at = None
+                self._count("hedge")
+                futures[self._submit(fn, *args, **kwargs)] = True
+        raise error
+
+    def stream(self, open_stream, fallback=None):
+        """
+        Items of the generator `open_stream()` returns, with the deadline, hedging, retries and
+        breaker applied up to its first item: if that item is later than the "stream" latency
+        percentile a second stream is opened, whichever yields first is passed on and the other
+        is closed. After the first item the stream is passed through as is, a failure mid-stream
+        can't be retried without repeating what was already sent.
+        """
+        if not self.breaker.allow():
+            self._count("circuit_open")
+            yield from self._fallback(fallback)
+            return
+
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retry")
+                self._backoff(attempt)
+            try:
+                stream, first = self._attempt_stream(open_stream)
+            except Exception as e:
+                error = e
+                self._count("timeout" if isinstance(e, TimeoutError) else "error")
+                if self.breaker.record_failure():
+                    print(f"{self.name}: circuit opened after repeated failures ({e})")
+                    break
+                continue
+            self.breaker.record_success()
+            if first is None:
+                return  # ended without items, e.g. the turn was cancelled
+            yield first
+            yield from stream
+            return
+
+        if fallback is None:
+            raise error
+        print(f"{self.name}: giving up on the stream ({error}), using the fallback")
+        yield from self._fallback(fallback)
+
+    def _attempt_stream(self, open_stream):
+        """(stream, first item) of the stream that answers first, at most one hedged duplicate, within one deadline"""
+        start = time.monotonic()
+        deadline = start + self.timeout_s
+        hedge_at = self._hedge_at("stream", start)
+
+        stream = open_stream()
+        streams = {self._submit(next, stream, None): (stream, False)}  # first-item future -> (stream, is the hedge)
+        error = None
+        try:
+            while streams:
+                now = time.monotonic()
+                wake_at = min(deadline, hedge_at) if hedge_at else deadline
+                done, _ = wait(streams, timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stream, hedged = streams.pop(future)
+                    if future.exception() is None:
+                        self._observe("stream", (time.monotonic() - start) * 1000)
+                        self._count("hedge_won" if hedged else "success")
+                        return stream, future.result()
+                    error = future.exception()
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutError(f"{self.name} sent nothing within {self.timeout_s}s")
+                if hedge_at and now >= hedge_at:
+                    hedge_at = None
+                    self._count("hedge")
+                    stream = open_stream()
+                    streams[self._submit(next, stream, None)] = (stream, True)
+            raise error
+        finally:
+            for future, (stream, _) in streams.items():
+                # close the losing or abandoned stream once its pending read returns
+                future.add_done_callback(lambda _, stream=stream: stream.close())
+
+    def _fallback(self, fallback):
+        if fallback is None:
+            raise ProviderUnavailable(f"{self.name} is unavailable (circuit open)")
+        self._count("fallback")
+        return fallback()
+
+    def stats(self):
+        with self.latency_lock:
+            latency = {operation: {"p95_ms": round(histogram.percentile(0.95), 1), "count": histogram.count}
+                       for operation, histogram in self.latency.items()}
+        return {"state": self.breaker.state, "failures": self.breaker.failures, "latency": latency}
@@ -0,0 +1,130 @@
+import re
+import queue
+import threading
+import time
+from src.core.TextSanitizer import TextSanitizer
+
+class SentenceChunker:
+    """Cuts a stream of text deltas into sentences as soon as each one is complete."""
+
+    # sentence end punctuation followed by whitespace, or a line break
+    BOUNDARY_PATTERN = re.compile(r'(?<=[.!?…])\s+|\n+')
+
+    def __init__(self, min_chars=12, keep_short=None):
+        self.min_chars = min_chars  # merge very short sentences ("¡Hola!") into the next one
+        self.keep_short = keep_short  # keep_short(sentence) -> True cuts a short sentence on its own anyway, e.g. banked audio
+        self.short_checked = {}  # short sentences judged since the last cut, so keep_short runs once per sentence
+        self.buffer = ""
+
+    def feed(self, text):
+        """Add a delta and return the sentences it completed."""
+        self.buffer += text
+        sentences = []
+        cut = segment_start = 0
+        for match in self.BOUNDARY_PATTERN.finditer(self.buffer):
+            candidate = self.buffer[cut:match.start()].strip()
+            segment = self.buffer[segment_start:match.start()].strip()
+            if segment_start > cut and self._keep_short(segment):
+                # a kept phrase right after a merged short sentence: cut both on their own
+                sentences.append(self.buffer[cut:segment_start].strip())
+                sentences.append(segment)
+                cut = match.end()
+            elif len(candidate) >= self.min_chars or self._keep_short(candidate):
+                sentences.append(candidate)
+                cut = match.end()
+            segment_start = match.end()
+        if cut:
+            self.buffer = self.buffer[cut:]
+            self.short_checked.clear()
+        return sentences
+
+    def _keep_short(self, candidate):
+        if self.keep_short is None or not candidate or len(candidate) >= self.min_chars:
+            return False
+        keep = self.short_checked.get(candidate)
+        if keep is None:
+            keep = self.short_checked[candidate] = self.keep_short(candidate)
+        return keep
+
+    def flush(self):
+        """Return whatever is left once the stream has ended."""
+        remainder = self.buffer.strip()
+        self.buffer = ""
+        self.short_checked.clear()
+        return [remainder] if remainder else []
+
+
+class SentencePipeline:
+    """
+    Consumes an LLM token stream on a background thread and queues up clean,
+    TTS-ready sentences so synthesis can start while the LLM is still generating.
+    Tokens are sanitized as they arrive, before sentence splitting.
+    """
+
+    def __init__(self, token_stream, on_complete=None, min_chars=12, turn=None, keep_short=None):
+        self.token_stream = token_stream
+        self.turn = turn  # TurnToken, pending sentences are dropped once it is cancelled
+        self.on_complete = on_complete  # called with the full cleaned response when the LLM is done
+        self.completion = None  # whatever on_complete returned, e.g. a Future for follow-up work
+        self.sanitizer = TextSanitizer()
+        self.chunker = SentenceChunker(min_chars=min_chars, keep_short=keep_short)
+        self.sentences = queue.Queue()
+        self.parts = []
+        self.error = None
+        self.first_token_ms = 0.0
+        self.llm_ms = 0.0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.start_time = time.time()
+        self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            for token in self.token_stream:
+                if self.cancelled:
+                    return
+                if not self.first_token_ms:
+                    self.first_token_ms = (time.time() - self.start_time) * 1000
+                clean = self.sanitizer.feed(token)
+                if not clean:
+                    continue  # whitespace held back, or nothing speakable (e.g. an emoji)
+                self.parts.append(clean)
+                for sentence in self.chunker.feed(clean):
+                    self._put(sentence)
+            self.sanitizer.flush()
+            for sentence in self.chunker.flush():
+                self._put(sentence)
+            self.llm_ms = (time.time() - self.start_time) * 1000
+            if self.on_complete and not self.cancelled:
+                self.completion = self.on_complete(self.response)
+        except Exception as e:
+            if self.cancelled:
+                return
+            print(f"Error in LLM stream: {e}")
+            self.error = e
+        finally:
+            self.sentences.put(None)  # end of stream marker
+
+    def _put(self, sentence):
+        if sentence:
+            self.sentences.put(sentence)
+
+    def __iter__(self):
+        """Yield sentences as they become available, blocking until the stream ends or the turn is cancelled."""
+        if self.turn:
+            self.turn.on_cancel(lambda: self.sentences.put(None))  # wake up a blocked consumer
+        while True:
+            sentence = self.sentences.get()
+            if sentence is None or self.cancelled:
+                return
+            yield sentence
+
+    @property
+    def cancelled(self):
+        return self.turn is not None and self.turn.cancelled
+
+    @property
+    def response(self):
+        return "".join(self.parts)
@@ -0,0 +1,54 @@
+import threading
+import time
+import traceback
+
+class ServiceReadiness:
+    """Builds the backends in parallel and tracks which ones are ready, for the /ready endpoint."""
+
+    PENDING = "pending"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.lock = threading.Lock()
+        self.backends = {}  # name -> {"state", "init_ms", "error"}
+
+    def start(self, name, factory, warm_up=None):
+        """Run `factory` (then the optional `warm_up(instance)`) on the executor, returns a Future of the instance."""
+        with self.lock:
+            self.backends[name] = {"state": self.PENDING, "init_ms": None, "error": None}
+        return self.executor.submit(self._build, name, factory, warm_up)
+
+    def _build(self, name, factory, warm_up):
+        start_time = time.time()
+        try:
+            instance = factory()
+            if warm_up:
+                self._set(name, state=self.WARMING)
+                try:
+                    warm_up(instance)
+                except Exception as e:
+                    # a failed warm-up only costs the first request its cold start
+                    print(f"{name} warm-up failed: {e}")
+        except Exception as e:
+            self._set(name, state=self.FAILED, error=str(e))
+            traceback.print_exc()
+            raise
+        init_ms = (time.time() - start_time) * 1000
+        self._set(name, state=self.READY, init_ms=round(init_ms, 1))
+        print(f"{name} ready in {init_ms:.1f}ms")
+        return instance
+
+    def _set(self, name, **fields):
+        with self.lock:
+            self.backends[name].update(fields)
+
+    def status(self):
+        with self.lock:
+            backends = {name: dict(info) for name, info in self.backends.items()}
+        return {
+            "ready": all(info["state"] == self.READY for info in backends.values()),
+            "backends": backends,
+        }
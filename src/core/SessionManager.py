@@ -0,0 +1,172 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from src.core.TurnToken import TurnToken
+
+class Session:
+    """One learner's conversation state. Hold `lock` while touching `memory`."""
+
+    def __init__(self, session_id, memory):
+        self.session_id = session_id
+        self.memory = memory
+        self.lock = threading.Lock()
+        self.last_access = time.time()
+        self.stt_speculative_turns = 0  # turns left with a speculative "es" STT request, re-armed when Whisper misdetects
+        self.version = 0  # bumped on every change, the store keeps the highest version written
+        self.turn = None
+
+    def to_record(self):
+        """Persistent part of the session, call with `lock` held."""
+        return {"memory": self.memory.to_record(), "stt_speculative_turns": self.stt_speculative_turns, "version": self.version}
+
+    def restore(self, record):
+        self.memory.restore(record.get("memory", {}))
+        self.stt_speculative_turns = record.get("stt_speculative_turns", 0)
+        self.version = record.get("version", 0)
+
+    def start_turn(self):
+        """Cancel whatever turn is still in flight (barge-in) and return a token for the new one."""
+        with self.lock:
+            previous, self.turn = self.turn, TurnToken()
+            turn = self.turn
+        if previous:
+            previous.cancel()
+        return turn
+
+    def cancel_turn(self):
+        with self.lock:
+            turn = self.turn
+        if turn:
+            turn.cancel()
+
+
+class SessionManager:
+    """
+    Thread-safe registry of per-learner sessions keyed by session ID.
+    Least recently used sessions are evicted once `max_sessions` is reached,
+    and idle sessions expire after `ttl_seconds`.
+    With a SessionStore, changed sessions are written behind (see SessionWriter) and a session
+    this process doesn't hold, after a restart or evicted, is loaded on its first request.
+    A session it does hold is checked against the store's version on every access and reloaded
+    if another worker saved a newer one, so requests for a learner may alternate between workers.
+    """
+
+    def __init__(self, create_memory, max_sessions=256, ttl_seconds=3600, store=None, writer=None):
+        self.create_memory = create_memory  # factory returning a fresh MemoryState
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self.store = store
+        self.writer = writer  # SessionWriter for `store`
+        self.resumed = 0
+        self.refreshed = 0  # held sessions reloaded because another worker saved a newer version
+
+    @staticmethod
+    def new_session_id():
+        return uuid.uuid4().hex
+
+    def get(self, session_id):
+        """Return the session for `session_id`, resuming it from the store or creating it if it is unknown or expired."""
+        return self._get(session_id, create=True)
+
+    def resume(self, session_id):
+        """Return the session if this process or the store knows it, None otherwise (nothing is created)."""
+        return self._get(session_id, create=False)
+
+    def _get(self, session_id, create):
+        now = time.time()
+        with self.lock:
+            evicted = self._evict_expired(now)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+                session.last_access = now
+        self._cancel_turns(evicted)
+        if session is not None:
+            if self.store:
+                self._refresh(session)
+            return session
+
+        # not held here: the store read happens outside the lock so other learners aren't held up
+        record = self.store.load(session_id) if self.store else None
+        if record is None and not create:
+            return None
+        session = Session(session_id, self.create_memory())
+        if record is not None:
+            session.restore(record)
+
+        with self.lock:
+            existing = self.sessions.get(session_id)
+            if existing is not None:
+                session = existing  # a concurrent request for the same learner got here first
+                self.sessions.move_to_end(session_id)
+            else:
+                self.sessions[session_id] = session
+                if record is not None:
+                    self.resumed += 1
+                while len(self.sessions) > self.max_sessions:
+                    evicted_id, evicted_session = self.sessions.popitem(last=False)
+                    evicted.append(evicted_session)
+                    print(f"Evicted session {evicted_id} (max sessions reached)")
+            session.last_access = now
+        self._cancel_turns(evicted)
+        return session
+
+    def _refresh(self, session):
+        """Reload a held session if the store has a newer version (the learner's last turn ran on another worker)"""
+        stored_version = self.store.version(session.session_id)
+        with session.lock:
+            if stored_version is None or stored_version <= session.version:
+                return
+        record = self.store.load(session.session_id)
+        if record is None:
+            return
+        with session.lock:
+            if record.get("version", 0) <= session.version:
+                return  # changed here meanwhile
+            session.restore(record)
+        with self.lock:
+            self.refreshed += 1
+
+    def exists(self, session_id):
+        with self.lock:
+            return session_id in self.sessions
+
+    def mark_dirty(self, session):
+        """The session changed, queue it for the store (no-op without one)."""
+        if self.writer:
+            with session.lock:
+                session.version += 1
+            self.writer.mark_dirty(session)
+
+    def remove(self, session_id):
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session:
+            session.cancel_turn()
+        if self.writer:
+            self.writer.delete(session_id)
+
+    def _evict_expired(self, now):
+        """Drop the sessions idle past the TTL and return them, the caller cancels their turns outside the lock."""
+        # sessions are kept in access order, so expired ones are always at the front
+        evicted = []
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if now - session.last_access < self.ttl_seconds:
+                break
+            self.sessions.popitem(last=False)
+            evicted.append(session)
+        return evicted
+
+    @staticmethod
+    def _cancel_turns(sessions):
+        # an evicted learner may still have a reply streaming, stop the LLM and TTS work behind it
+        for session in sessions:
+            session.cancel_turn()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.sessions)
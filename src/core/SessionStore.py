@@ -0,0 +1,66 @@
+import json
+import zlib
+
+class SessionStore:
+    """
+    Where learner sessions outlive the process, so a restarted worker (or another one behind
+    the same load balancer) can resume a conversation. Records are compact JSON, zlib-compressed;
+    backends only move opaque blobs keyed by session ID.
+
+    Every record carries the session's version. Writes are conditional: a record only replaces
+    a lower version, so a worker holding a stale copy can't overwrite a newer one.
+
+    A backend implements `read`, `read_version`, `write_batch` and `prune`. SqliteSessionStore is
+    the local one; a Redis-compatible backend would keep the version in a second key (or a hash
+    field) for `read_version`, make `write_batch` one pipelined round trip of a small script that
+    compares versions before SET ... EX <ttl> / DEL, and leave `prune` empty since keys expire by themselves.
+    """
+
+    COMPRESSION_LEVEL = 6  # writes happen off the request path, size matters more than speed here
+
+    @classmethod
+    def encode(cls, record):
+        return zlib.compress(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), cls.COMPRESSION_LEVEL)
+
+    @staticmethod
+    def decode(blob):
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def load(self, session_id):
+        """The stored record for this session, or None if there is none (or it can't be read)"""
+        try:
+            blob = self.read(session_id)
+            return self.decode(blob) if blob is not None else None
+        except Exception as e:
+            print(f"Could not load session {session_id}: {e}")
+            return None
+
+    def version(self, session_id):
+        """Version of the stored record, None if there is none (or the store can't be reached)"""
+        try:
+            return self.read_version(session_id)
+        except Exception as e:
+            print(f"Could not check session {session_id}: {e}")
+            return None
+
+    def read(self, session_id):
+        """Encoded record, None if unknown or expired"""
+        raise NotImplementedError
+
+    def read_version(self, session_id):
+        """Stored version, None if unknown or expired"""
+        raise NotImplementedError
+
+    def write_batch(self, records, deleted=()):
+        """
+        Store {session_id: (version, encoded record)}, each only over a lower stored version, and
+        remove `deleted` IDs, in one transaction/round trip
+        """
+        raise NotImplementedError
+
+    def prune(self):
+        """Drop expired sessions"""
+        pass
+
+    def close(self):
+        pass
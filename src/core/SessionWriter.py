@@ -0,0 +1,120 @@
+import atexit
+import threading
+import time
+from src.core.SessionStore import SessionStore
+
+class SessionWriter:
+    """
+    Write-behind for a SessionStore. Request threads only mark a session dirty; a background
+    thread serializes every dirty session and writes them in one batch per `flush_interval`.
+    A session changed several times in between is written once, in its latest state.
+    A batch the store rejects is queued again (sessions changed meanwhile keep their newer
+    entry) and retried after a backoff that doubles up to `max_retry_delay`.
+    """
+
+    def __init__(self, store, flush_interval=0.5, max_batch=256, prune_interval=300, max_retry_delay=30.0):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_retry_delay = max_retry_delay
+        self.retry_delay = 0.0  # current backoff, 0 while the store is healthy
+        self.max_batch = max_batch  # write early once this many sessions are waiting
+        self.prune_interval = prune_interval
+        self.pending = {}  # session_id -> Session to save, or None to delete
+        self.condition = threading.Condition()
+        self.closed = False
+        self.batches = 0
+        self.sessions_written = 0
+        self.errors = 0
+        self.retries = 0
+        self.thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def mark_dirty(self, session):
+        with self.condition:
+            first = not self.pending
+            self.pending[session.session_id] = session
+            if first or len(self.pending) >= self.max_batch:
+                self.condition.notify()  # start the flush timer, or write right away if the batch is full
+
+    def delete(self, session_id):
+        with self.condition:
+            first = not self.pending
+            self.pending[session_id] = None
+            if first:
+                self.condition.notify()
+
+    def _run(self):
+        next_prune = time.monotonic() + self.prune_interval
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait(timeout=self.prune_interval)
+                    if time.monotonic() >= next_prune:
+                        break
+                if self.pending and not self.closed and len(self.pending) < self.max_batch:
+                    self.condition.wait(timeout=self.flush_interval)  # let more changes pile up
+                retry_at = time.monotonic() + self.retry_delay
+                while self.retry_delay and not self.closed and time.monotonic() < retry_at:
+                    self.condition.wait(timeout=retry_at - time.monotonic())  # the store is failing, back off
+                batch, self.pending = self.pending, {}
+                closing = self.closed
+            if batch and not self._write(batch):
+                if closing:
+                    print(f"Session store still failing at shutdown, {len(batch)} sessions not written")
+                else:
+                    self._requeue(batch)
+            if time.monotonic() >= next_prune:
+                next_prune = time.monotonic() + self.prune_interval
+                self._prune()
+            if closing:
+                return
+
+    def _write(self, batch):
+        """Write one batch, False if the store failed"""
+        records = {}
+        deleted = []
+        for session_id, session in batch.items():
+            if session is None:
+                deleted.append(session_id)
+                continue
+            with session.lock:
+                record = session.to_record()
+            records[session_id] = (record["version"], SessionStore.encode(record))
+        try:
+            self.store.write_batch(records, deleted)
+        except Exception as e:
+            print(f"Session store write failed ({len(batch)} sessions): {e}")
+            self.errors += 1
+            return False
+        self.retry_delay = 0.0
+        self.batches += 1
+        self.sessions_written += len(records)
+        return True
+
+    def _requeue(self, batch):
+        with self.condition:
+            for session_id, session in batch.items():
+                self.pending.setdefault(session_id, session)  # a newer save or delete queued meanwhile wins
+            self.retry_delay = min(max(self.retry_delay * 2, self.flush_interval), self.max_retry_delay)
+        self.retries += 1
+
+    def _prune(self):
+        try:
+            self.store.prune()
+        except Exception as e:
+            print(f"Session store prune failed: {e}")
+
+    def close(self):
+        """Write whatever is pending and stop the writer thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread.is_alive():
+            self.thread.join(timeout=5)
+
+    def stats(self):
+        with self.condition:
+            pending = len(self.pending)
+        return {"pending": pending, "batches": self.batches, "sessions_written": self.sessions_written,
+                "errors": self.errors, "retries": self.retries, "retry_delay_s": self.retry_delay}
@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import threading
+import time
+from src.core.SessionStore import SessionStore
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sessions in a local SQLite file in WAL mode: readers never wait for the writer, and several
+    server processes on one machine can share the file.
+    """
+
+    def __init__(self, db_path="cache/sessions.sqlite3", ttl_seconds=3600):
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent, only the last commits can be lost on power failure
+        self.db.execute("PRAGMA busy_timeout=5000")  # another process may be writing
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL, version INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(sessions)")]
+        if "version" not in columns:  # file from before versioned writes
+            self.db.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self.db.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+        self.db.commit()
+
+    def read(self, session_id):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT data FROM sessions WHERE session_id = ? AND updated_at >= ?",
+                (session_id, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+
+    def read_version(self, session_id):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT version FROM sessions WHERE session_id = ? AND updated_at >= ?",
+                (session_id, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+
+    def write_batch(self, records, deleted=()):
+        now = time.time()
+        with self.lock:
+            with self.db:  # one transaction for the whole batch
+                if records:
+                    self.db.executemany(
+                        "INSERT INTO sessions (session_id, data, updated_at, version) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (session_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at, "
+                        "version = excluded.version WHERE excluded.version > sessions.version",
+                        [(session_id, blob, now, version) for session_id, (version, blob) in records.items()]
+                    )
+                if deleted:
+                    self.db.executemany("DELETE FROM sessions WHERE session_id = ?", [(session_id,) for session_id in deleted])
+
+    def prune(self):
+        with self.lock:
+            with self.db:
+                self.db.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,82 @@
+import re
+
+class _StripTable(dict):
+    """
+    str.translate table that fills itself in: the first time a character shows up its fate is
+    decided once and stored, after that lookups are plain C dict hits. Stays as small as the
+    set of characters actually seen instead of enumerating the ~1M code points we drop.
+    """
+
+    def __missing__(self, codepoint):
+        value = None if TextSanitizer.is_stripped(codepoint) else codepoint
+        self[codepoint] = value
+        return value
+
+
+class TextSanitizer:
+    """
+    Makes LLM output TTS-safe: drops emojis/pictographs and markdown formatting characters,
+    collapses runs of spaces/tabs and of newlines, trims both ends.
+    Works on a whole string (`clean`) or incrementally on a token stream (`feed`/`flush`),
+    carrying a pending whitespace run across chunk boundaries so the streamed result is
+    identical to cleaning the full text at once.
+    """
+
+    # everything from U+24C2 up (enclosed chars, dingbats, symbols, CJK, the supplemental
+    # planes...) plus a few lower emoji/joiner code points, same set as the old emoji regex
+    STRIP_FROM = 0x24C2
+    STRIP_SINGLES = frozenset((0x200D, 0x231A, 0x23CF, 0x23E9))
+    FORMAT_CHARS = "\\*_~`[]"
+
+    TABLE = _StripTable({ord(char): None for char in FORMAT_CHARS})
+    TABLE[ord("\t")] = " "
+
+    # after the table, spaces and newlines are the only whitespace runs left to collapse
+    COLLAPSE_PATTERN = re.compile(r"( ) +|(\n)\n+")
+
+    def __init__(self):
+        self.pending = ""  # trailing whitespace not emitted yet, it may merge with the next chunk or be trimmed
+        self.started = False  # leading whitespace of the whole stream is dropped
+
+    @classmethod
+    def is_stripped(cls, codepoint):
+        return codepoint >= cls.STRIP_FROM or codepoint in cls.STRIP_SINGLES
+
+    @classmethod
+    def _collapse(cls, text):
+        # substring checks are far cheaper than a regex pass that finds nothing
+        if "  " in text or "\n\n" in text:
+            return cls.COLLAPSE_PATTERN.sub(r"\1\2", text)
+        return text
+
+    @classmethod
+    def clean(cls, text):
+        """One-shot clean of a complete text"""
+        return cls._collapse(text.translate(cls.TABLE)).strip()
+
+    def feed(self, chunk):
+        """Clean the next chunk of a stream, returns the text that is safe to emit now"""
+        # most LLM deltas are a word or two, only the new chunk goes through the table
+        text = chunk.translate(self.TABLE)
+        if not text:
+            return ""
+        if self.pending:
+            text = self.pending + text
+        text = self._collapse(text)
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self.started = True
+        if not text[-1].isspace():
+            self.pending = ""
+            return text
+        body = text.rstrip()
+        self.pending = text[len(body):]
+        return body
+
+    def flush(self):
+        """End of stream: trailing whitespace is trimmed, so nothing is left to emit"""
+        self.pending = ""
+        self.started = False
+        return ""
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+class TranslationCache:
+    """
+    Two-tier translation cache keyed by (text, source, target): an in-memory LRU
+    in front of a SQLite file, so repeated phrases and words survive restarts.
+    """
+
+    def __init__(self, db_path="cache/translations.sqlite3", max_memory_entries=4096):
+        self.max_memory_entries = max_memory_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "text TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL, translation TEXT NOT NULL, "
+            "PRIMARY KEY (text, source, target))"
+        )
+        self.db.commit()
+
+    def get(self, text, source, target):
+        return self.get_many([text], source, target).get(text)
+
+    def get_many(self, texts, source, target):
+        """Return {text: translation} for every text that is cached, memory first then disk."""
+        found = {}
+        missing = []
+        with self.lock:
+            for text in texts:
+                key = (text, source, target)
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    found[text] = self.memory[key]
+                    self.hits += 1
+                else:
+                    missing.append(text)
+
+            for text in missing:
+                row = self.db.execute(
+                    "SELECT translation FROM translations WHERE text = ? AND source = ? AND target = ?",
+                    (text, source, target)
+                ).fetchone()
+                if row:
+                    found[text] = row[0]
+                    self._remember((text, source, target), row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+        return found
+
+    def put(self, text, source, target, translation):
+        self.put_many({text: translation}, source, target)
+
+    def put_many(self, translations, source, target):
+        with self.lock:
+            for text, translation in translations.items():
+                self._remember((text, source, target), translation)
+            self.db.executemany(
+                "INSERT OR REPLACE INTO translations (text, source, target, translation) VALUES (?, ?, ?, ?)",
+                [(text, source, target, translation) for text, translation in translations.items()]
+            )
+            self.db.commit()
+
+    def _remember(self, key, translation):
+        self.memory[key] = translation
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+            }
@@ -0,0 +1,37 @@
+import threading
+
+class TurnToken:
+    """
+    Cooperative cancellation for one conversation turn. Work in flight checks `cancelled`
+    between steps and registers callbacks (closing the LLM stream, cancelling the gRPC
+    TTS call...) to abort blocking I/O as soon as a new turn starts or the client leaves.
+    """
+
+    def __init__(self):
+        self.cancelled_event = threading.Event()
+        self.callbacks = []
+        self.lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.cancelled_event.is_set()
+
+    def on_cancel(self, callback):
+        """Run `callback` when the turn is cancelled (immediately if it already is)."""
+        with self.lock:
+            if not self.cancelled:
+                self.callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self):
+        with self.lock:
+            if self.cancelled:
+                return
+            self.cancelled_event.set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error while cancelling turn: {e}")
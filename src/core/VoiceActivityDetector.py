@@ -0,0 +1,85 @@
+import io
+import math
+import wave
+from array import array
+from collections import deque
+
+class VoiceActivityDetector:
+    """
+    Energy-based end-of-utterance detection over a live 16-bit mono PCM stream.
+    Feed it microphone chunks as they arrive; it returns each utterance (with a little
+    pre-roll) as soon as enough trailing silence has been seen.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=30, threshold=500, start_frames=3, end_silence_ms=700, pre_roll_ms=300, max_utterance_sec=30):
+        self.sample_rate = sample_rate
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * 2
+        self.threshold = threshold  # RMS of int16 samples above which a frame counts as speech
+        self.start_frames = start_frames  # consecutive voiced frames needed to start an utterance
+        self.end_silence_frames = max(1, end_silence_ms // frame_ms)
+        self.max_utterance_frames = int(max_utterance_sec * 1000 / frame_ms)
+        self.pre_roll = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self.pending = bytearray()
+        self.reset()
+
+    def reset(self):
+        self.speaking = False
+        self.voiced_run = 0
+        self.silent_run = 0
+        self.utterance = []
+        self.pre_roll.clear()
+
+    def feed(self, pcm):
+        """Add a chunk of PCM and return the list of utterances it completed."""
+        self.pending.extend(pcm)
+        utterances = []
+        while len(self.pending) >= self.frame_bytes:
+            frame = bytes(self.pending[:self.frame_bytes])
+            del self.pending[:self.frame_bytes]
+            utterance = self._process_frame(frame)
+            if utterance:
+                utterances.append(utterance)
+        return utterances
+
+    def flush(self):
+        """End the current utterance now (e.g. the client released the talk button)."""
+        utterance = b"".join(self.utterance) if self.speaking else None
+        self.pending.clear()
+        self.reset()
+        return utterance
+
+    def _process_frame(self, frame):
+        voiced = self.rms(frame) >= self.threshold
+        if not self.speaking:
+            self.pre_roll.append(frame)
+            self.voiced_run = self.voiced_run + 1 if voiced else 0
+            if self.voiced_run >= self.start_frames:
+                self.speaking = True
+                self.silent_run = 0
+                self.utterance = list(self.pre_roll)
+            return None
+
+        self.utterance.append(frame)
+        self.silent_run = 0 if voiced else self.silent_run + 1
+        if self.silent_run >= self.end_silence_frames or len(self.utterance) >= self.max_utterance_frames:
+            utterance = b"".join(self.utterance)
+            self.reset()
+            return utterance
+        return None
+
+    @staticmethod
+    def rms(frame):
+        samples = array("h", frame)
+        if not samples:
+            return 0.0
+        return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+    def to_wav(self, pcm):
+        """Wrap raw PCM in a WAV container for the STT API."""
+        output = io.BytesIO()
+        with wave.open(output, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(pcm)
+        return output.getvalue()
@@ -0,0 +1,32 @@
+import re
+import unicodedata
+from collections import namedtuple
+
+# start/end are code point offsets into the (NFC normalized) sentence, key is what gets translated and cached
+Token = namedtuple("Token", ["word", "start", "end", "key"])
+
+class WordTokenizer:
+    """
+    Splits Spanish/English sentences into words for word-by-word translation.
+    Punctuation (¿ ? ¡ ! , ...), digits and whitespace are never part of a word,
+    accented letters and ñ/ü are, and so are inner apostrophes and hyphens (don't, franco-mexicano).
+    """
+
+    WORD_PATTERN = re.compile(r"[^\W\d_]+(?:['’\-][^\W\d_]+)*")
+
+    @classmethod
+    def tokenize(cls, sentence):
+        """Word tokens of a sentence, in order, duplicates included so they stay aligned with the text"""
+        # composed form so "está" typed with a combining accent matches the precomposed one
+        sentence = unicodedata.normalize("NFC", sentence)
+        return [Token(match.group(), match.start(), match.end(), cls.normalize(match.group())) for match in cls.WORD_PATTERN.finditer(sentence)]
+
+    @staticmethod
+    def normalize(word):
+        # "Hola" and "hola" translate the same, so they share one request slot and cache entry
+        return unicodedata.normalize("NFC", word).casefold().replace("’", "'")
+
+    @classmethod
+    def unique_keys(cls, tokenized_sentences):
+        """Distinct keys across many tokenized sentences, first-seen order"""
+        return list(dict.fromkeys(token.key for tokens in tokenized_sentences for token in tokens))
@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class WorkerPool:
+    """
+    Process-wide thread pool for blocking provider I/O (Groq, Google).
+    WebApp and the managers submit independent calls here (translation alongside TTS, the
+    speculative "es" transcription, word-translation batches, history summaries) and get a
+    concurrent.futures.Future back, so one request can overlap them.
+    """
+
+    _executor = None
+    _max_workers = 32
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, max_workers):
+        """Set the pool size, must be called before the first submit."""
+        with cls._lock:
+            if cls._executor is not None:
+                raise RuntimeError("WorkerPool already started")
+            cls._max_workers = max_workers
+
+    @classmethod
+    def submit(cls, fn, *args, **kwargs):
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(max_workers=cls._max_workers, thread_name_prefix="io")
+        return cls._executor.submit(fn, *args, **kwargs)
+
+    @classmethod
+    def shutdown(cls):
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from flask import Response, request
+
+try:
+    import brotli  # optional, pip install brotli
+except ImportError:
+    brotli = None
+
+
+class StaticFile:
+    """One file of the build: its variants by content-encoding, each with its own ETag."""
+
+    def __init__(self, mimetype, cache_control):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.variants = {}  # "identity" / "gzip" / "br" -> (bytes, etag)
+
+
+class StaticAssets:
+    """
+    The built frontend (frontend/dist) held in memory, gzip and brotli variants compressed once
+    at startup, so serving a file is a dict lookup and a write instead of disk reads on the
+    threads that run voice turns. Vite's content-hashed files under assets/ are cached by the
+    browser for a year without revalidation; everything else (index.html) revalidates by ETag.
+    Conditional and range requests go through werkzeug's make_conditional.
+    The build is read once, restart the server after rebuilding the frontend.
+    """
+
+    HASHED_NAME = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")  # e.g. assets/index-Bj7BHN67.js
+    IMMUTABLE = "public, max-age=31536000, immutable"
+    REVALIDATE = "no-cache"
+    MIN_COMPRESS_BYTES = 512  # below this the headers outweigh the savings
+    COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+    ENCODING_PREFERENCE = ("br", "gzip")  # on equal client quality, smallest first
+
+    def __init__(self, root):
+        self.root = root
+        self.files = {}  # path relative to root with "/" separators -> StaticFile
+        self.identity_bytes = 0
+        self.compressed_bytes = 0
+        if os.path.isdir(root):
+            for directory, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
+                    self._load(os.path.relpath(path, root).replace(os.sep, "/"), path)
+        print(f"Static assets: {len(self.files)} files, {self.identity_bytes // 1024} KiB "
+              f"({self.compressed_bytes // 1024} KiB compressed{'' if brotli else ', no brotli'})")
+
+    def _load(self, relative_path, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        mimetype = mimetypes.guess_type(relative_path)[0] or "application/octet-stream"
+        cache_control = self.IMMUTABLE if self.HASHED_NAME.match(relative_path) else self.REVALIDATE
+        static_file = StaticFile(mimetype, cache_control)
+        digest = hashlib.sha256(data).hexdigest()[:20]
+        static_file.variants["identity"] = (data, digest)
+        self.identity_bytes += len(data)
+
+        if len(data) >= self.MIN_COMPRESS_BYTES and mimetype.startswith(self.COMPRESSIBLE_TYPES):
+            candidates = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli:
+                candidates["br"] = brotli.compress(data, quality=11)
+            for encoding, compressed in candidates.items():
+                if len(compressed) < len(data):
+                    static_file.variants[encoding] = (compressed, f"{digest}-{encoding}")
+                    self.compressed_bytes += len(compressed)
+        self.files[relative_path] = static_file
+
+    def __contains__(self, relative_path):
+        return relative_path in self.files
+
+    def _negotiate(self, static_file):
+        """Best encoding the client accepts; byte ranges always refer to the uncompressed file"""
+        if request.range is not None or len(static_file.variants) == 1:
+            return "identity"
+        best, best_quality = "identity", 0
+        for encoding in self.ENCODING_PREFERENCE:
+            if encoding in static_file.variants:
+                quality = request.accept_encodings[encoding]
+                if quality > best_quality:
+                    best, best_quality = encoding, quality
+        return best
+
+    def response(self, relative_path):
+        """Response for a file of the build (304 / 206 / 416 as the request asks), None if there is no such file"""
+        static_file = self.files.get(relative_path)
+        if static_file is None:
+            return None
+        encoding = self._negotiate(static_file)
+        data, etag = static_file.variants[encoding]
+
+        response = Response(data, mimetype=static_file.mimetype)
+        response.headers["Cache-Control"] = static_file.cache_control
+        if len(static_file.variants) > 1:
+            response.vary.add("Accept-Encoding")
+        if encoding != "identity":
+            response.content_encoding = encoding
+        response.set_etag(etag)
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(data))
@@ -1,90 +1,212 @@
-from flask import Flask, render_template, request, jsonify, Response
+from flask import Flask, render_template, request, jsonify, Response, g
 import os
-import tempfile
 import time
 import json
+import struct
 import threading
+import queue
 from src.Utils import Utils
+from src.core.SentencePipeline import SentencePipeline
+from src.core.WorkerPool import WorkerPool
+from src.core.VoiceActivityDetector import VoiceActivityDetector
+from src.core.LatencyTrace import LatencyTrace
+from src.core.MetricsRegistry import MetricsRegistry
+from src.core.LatencyLogWriter import LatencyLogWriter
+from src.flask.StaticAssets import StaticAssets
+
+try:
+    from flask_sock import Sock, ConnectionClosed  # optional, enables the /ws/voice endpoint
+except ImportError:
+    Sock = None
 
 class WebApp:
-    def __init__(self, conversation):
+    SESSION_COOKIE = 'tutor_session'
+
+    # binary transport (?transport=binary): each frame is a 1-byte type and a 4-byte
+    # big-endian payload length, followed by the payload
+    FRAME_AUDIO = 1  # raw 24kHz 16-bit little-endian mono PCM
+    FRAME_EVENT = 2  # UTF-8 JSON, same payloads as the SSE events
+    OUTPUT_BYTES_PER_SEC = 24000 * 2  # TTS output is 24kHz 16-bit mono PCM
+    MAX_WORD_TRANSLATION_SENTENCES = 200
+
+    def __init__(self, conversation, max_concurrent_turns=24, turn_wait_seconds=5, vad_config=None, readiness=None, latency_log_path=None, metrics=None, precompressed_static=False, voice_socket=True):
         # tell Flask to serve the React build (frontend/dist)
         current_dir = os.path.dirname(__file__)
         project_root = os.path.abspath(os.path.join(current_dir, '..', '..'))
         dist_dir = os.path.join(project_root, 'frontend', 'dist')
-        
+
+        # precompressed_static: the whole build served from memory (see StaticAssets) instead of Flask's static handler
+        self.static_assets = StaticAssets(dist_dir) if precompressed_static else None
         self.app = Flask(__name__, 
                          template_folder=dist_dir,
-                         static_folder=os.path.join(dist_dir, 'assets'),
+                         static_folder=None if self.static_assets else os.path.join(dist_dir, 'assets'),
                          static_url_path='/assets')
         self.conversation = conversation
+        # bound how many voice/text turns run at once so one process degrades gracefully under load
+        self.turn_slots = threading.BoundedSemaphore(max_concurrent_turns)
+        self.turn_wait_seconds = turn_wait_seconds
+        self.vad_config = vad_config or {}
+        self.readiness = readiness  # ServiceReadiness, backends may still be loading when the server starts
+        self.voice_socket = voice_socket  # only when served by werkzeug, waitress can't upgrade connections to WebSockets
+        # per-turn span timings go to in-process histograms (/metrics) and, optionally, a CSV log;
+        # the registry may be shared with the provider call policies (provider.* entries)
+        self.metrics = metrics or MetricsRegistry()
+        self.latency_log = LatencyLogWriter(latency_log_path, LatencyTrace.columns("input_duration_sec", "output_duration_sec")) if latency_log_path else None
         self.setup_routes()
 
     def setup_routes(self):
+        @self.app.after_request
+        def set_session_cookie(response):
+            # hand out the session ID the first time we see a browser
+            if g.get('new_session_id'):
+                response.set_cookie(self.SESSION_COOKIE, g.new_session_id, httponly=True, samesite='Lax')
+            return response
+
         @self.app.route('/')
         def index():
+            self._get_session()  # hand out the session cookie up front so the voice socket carries it
+            if self.static_assets and 'index.html' in self.static_assets:
+                return self.static_assets.response('index.html')
             return render_template('index.html')
+
+        if self.static_assets:
+            @self.app.route('/<path:filename>')
+            def static_file(filename):
+                # hashed bundle under /assets plus root files like /vite.svg, other routes take precedence
+                response = self.static_assets.response(filename)
+                return response if response is not None else ('Not found', 404)
+
+        @self.app.route('/ready')
+        def ready():
+            # per-backend warm status, 503 until everything is up (for load balancer health checks),
+            # plus whether this server offers /ws/voice so the frontend only shows hands-free when it works
+            if self.readiness is None:
+                return jsonify({'ready': True, 'backends': {}, 'voice_socket': self.voice_socket_enabled})
+            status = {**self.readiness.status(), 'voice_socket': self.voice_socket_enabled}
+            return jsonify(status), (200 if status['ready'] else 503)
+
+        @self.app.route('/metrics')
+        def metrics():
+            # latency histograms (ms) per turn kind and span, e.g. "stream.first_audio"
+            snapshot = self.metrics.snapshot()
+            # per-component counters: LLM token usage, caches, phrase bank, STT batching, provider policies
+            snapshot.update(self.conversation.component_stats())
+            if self.conversation.summarizer:
+                snapshot["history_summary"] = self.conversation.summarizer.stats()
+            if self.conversation.sessions.writer:
+                snapshot["session_store"] = {**self.conversation.sessions.writer.stats(), "resumed": self.conversation.sessions.resumed, "refreshed": self.conversation.sessions.refreshed}
+            return jsonify(snapshot)
+
+        @self.app.route('/translate/words', methods=['POST'])
+        def translate_words():
+            # hover translations for many messages in one call, aligned per sentence
+            payload = request.get_json(silent=True) or {}
+            sentences = payload.get('sentences')
+            if not isinstance(sentences, list) or not all(isinstance(sentence, str) for sentence in sentences):
+                return jsonify({'error': 'sentences must be a list of strings'}), 400
+            if len(sentences) > self.MAX_WORD_TRANSLATION_SENTENCES:
+                return jsonify({'error': f'At most {self.MAX_WORD_TRANSLATION_SENTENCES} sentences per request'}), 400
+            words = self.conversation.translator.translate_words_batch(
+                sentences,
+                source_language=payload.get('source', 'es'),
+                target_language=payload.get('target', 'en')
+            )
+            return jsonify({'sentences': words})
+
+        self.voice_socket_enabled = False
+        if not self.voice_socket:
+            print("/ws/voice disabled, the pooled server can't upgrade to WebSockets (use server_mode \"threaded\")")
+        elif Sock is not None:
+            sock = Sock(self.app)
+            self.voice_socket_enabled = True
+
+            @sock.route('/ws/voice')
+            def voice_socket(ws):
+                self._run_voice_socket(ws)
+        else:
+            print("flask-sock not installed, /ws/voice disabled")
         
         @self.app.route('/chat', methods=['POST'])
         def chat():
             user_message = request.json.get('message', '')
+            if not self.turn_slots.acquire(timeout=self.turn_wait_seconds):
+                return jsonify({'error': 'Server busy, try again'}), 503
             try:
                 if not user_message.strip():
-                    return "Please say something", "", 0, 0
-                
-                formatted_prompt = self.conversation.memory.build_prompt(user_message)
+                    return jsonify({'error': 'Please say something'}), 400
 
-                start_time = time.time()
-                response = self.conversation.llm.ask(formatted_prompt)
-                llm_ms = (time.time() - start_time) * 1000
+                trace = LatencyTrace("text")
+                session = self._get_session()
+                session.start_turn()  # stops any voice reply still streaming for this learner
+                with session.lock:
+                    messages = session.memory.build_messages(user_message)
 
-                start_time = time.time()
-                translation = self.conversation.translator.translate_text(response)
-                translate_ms = (time.time() - start_time) * 1000
-                print(f"Translation: {translation}")
+                with trace.span("llm"):
+                    response = self.conversation.llm.ask_messages(messages)
 
-                self.conversation.memory.add_exchange(user_message, response)
-                
+                # translation and TTS are independent, so overlap them
+                translation_future = WorkerPool.submit(self._translate, response)
+
+                self.conversation.remember_exchange(session, user_message, response)
+
+                with trace.span("tts"):
+                    audio_base64 = self.conversation.tts.synthesize_speech(response)
+                translation, translate_ms = translation_future.result()
+                trace.add("translation", translate_ms)
+                trace.mark("total")
+                output_duration_sec = self.conversation.tts.get_audio_duration(audio_base64) if audio_base64 else 0
+                self._log_performance_metrics(trace, output_duration_sec=output_duration_sec)
+                return jsonify({'response': response, 'translation': translation, 'audio': audio_base64})
             except Exception as e:
                 print(f"Error processing message: {e}")
-                return "Sorry, I encountered an error processing your message.", "", 0, 0
-            audio_base64 = self.conversation.tts.synthesize_speech(response)
-            return jsonify({'response': response, 'translation': translation, 'audio': audio_base64})
+                return jsonify({'error': 'Sorry, I encountered an error processing your message.'}), 500
+            finally:
+                self.turn_slots.release()
         
         # Streaming TTS endpoint
         @self.app.route('/chat/audio/stream', methods=['POST'])
         def chat_audio_stream():
-            temp_file_path = None
-            response_start = time.time()
+            trace = LatencyTrace("stream")
+            if not self.turn_slots.acquire(timeout=self.turn_wait_seconds):
+                return jsonify({'error': 'Server busy, try again'}), 503
+            slot_held_by_stream = False
             
             try:
-                # Validate and save audio file
-                audio_file = request.files.get('audio')
+                # Validate and read audio file, it stays in memory all the way to the STT client
+                with trace.span("upload"):
+                    audio_file = request.files.get('audio')
+                    audio_bytes = audio_file.read() if audio_file else None
                 if not audio_file:
                     return jsonify({'error': 'No audio file provided'})
                 
-                temp_file_path = self._save_audio_to_temp_file(audio_file)
+                session = self._get_session()
+                turn = session.start_turn()  # a new recording cancels the reply still in flight
                 
                 # Process audio input
-                user_message, stt_ms = self._process_audio_input(temp_file_path)
+                user_message, stt_ms = self._process_audio_input(session, audio_bytes)
+                trace.add("stt", stt_ms)
                 if not user_message:
                     return jsonify({'error': 'Could not transcribe audio'}), 400
                 
-                # Generate AI response
-                response, llm_ms = self._generate_ai_response(user_message)
+                # Start streaming the AI response, TTS starts on the first finished sentence
+                pipeline = self._start_ai_response_stream(session, user_message, turn)
 
                 # Get input duration
                 input_duration_sec = float(request.form.get('input_duration', 0))
-
-                response_time = (time.time() - response_start) * 1000
-                self._log_performance_metrics(input_duration_sec=input_duration_sec, stt_ms=stt_ms, llm_ms=llm_ms, response_time=response_time)
+                binary = request.args.get('transport') == 'binary'
 
                 # Return streaming response (translation happens inside the generator)
-                return Response(
-                    self._generate_streaming_response(user_message, response),
-                    mimetype='text/plain',
-                    headers={'Cache-Control': 'no-cache', 'Connection': 'keep-alive'}
+                stream_response = Response(
+                    self._generate_streaming_response(user_message, pipeline, trace, input_duration_sec, binary=binary),
+                    mimetype='application/octet-stream' if binary else 'text/plain',
+                    headers={'Cache-Control': 'no-cache'}
                 )
+                # closing the response stops the LLM and TTS work even if the client left before the
+                # first frame (the generator never ran), then frees the turn slot
+                stream_response.call_on_close(turn.cancel)
+                stream_response.call_on_close(self.turn_slots.release)
+                slot_held_by_stream = True
+                return stream_response
                 
             except ValueError as e:
                 return jsonify({'error': str(e)}), 400
@@ -92,36 +214,120 @@ class WebApp:
                 print(f"Error processing audio: {e}")
                 return jsonify({'error': 'Error processing audio'}), 500
             finally:
-                self._cleanup_temp_file(temp_file_path)
-
-    def _save_audio_to_temp_file(self, audio_file):
-        """Save uploaded audio file to temporary file and return path."""
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-            temp_file_path = temp_file.name
-            audio_file.save(temp_file_path)
-            return temp_file_path
-    
-    def _process_audio_input(self, temp_file_path):
+                if not slot_held_by_stream:
+                    self.turn_slots.release()
+
+    def _run_voice_socket(self, ws):
+        """
+        Full-duplex voice session: the browser streams 16kHz 16-bit mono PCM as binary messages,
+        server-side VAD finds the end of each utterance and the turn starts right away.
+        Replies use the binary frame format of /chat/audio/stream?transport=binary.
+        """
+        session = self._get_session()
+        vad = VoiceActivityDetector(**self.vad_config)
+        send_lock = threading.Lock()
+        utterances = queue.Queue()
+
+        def send(data):
+            with send_lock:
+                ws.send(data)
+
+        def run_turns():
+            # turns run one at a time, in order, while the socket keeps receiving audio
+            while True:
+                pcm = utterances.get()
+                if pcm is None:
+                    return
+                try:
+                    self._run_voice_turn(session, vad, pcm, send)
+                except ConnectionClosed:
+                    return
+                except Exception as e:
+                    # one failed turn must not end the conversation, the socket keeps listening
+                    print(f"Voice turn failed: {e}")
+                    try:
+                        send(self._binary_event({'type': 'error', 'error': 'Error processing audio'}))
+                    except ConnectionClosed:
+                        return
+
+        turn_thread = threading.Thread(target=run_turns, daemon=True)
+        turn_thread.start()
+        try:
+            while True:
+                message = ws.receive()
+                if isinstance(message, str):
+                    # control message, the client can force the end of an utterance (e.g. push-to-talk release)
+                    try:
+                        control = json.loads(message)
+                    except ValueError:
+                        continue  # not JSON, ignore it
+                    if not isinstance(control, dict) or control.get('type') != 'end_of_speech':
+                        continue
+                    pcm = vad.flush()
+                    ended = [pcm] if pcm else []
+                else:
+                    was_speaking = vad.speaking
+                    ended = vad.feed(message)
+                    if vad.speaking and not was_speaking:
+                        send(self._binary_event({'type': 'speech_start'}))
+                        session.cancel_turn()  # barge-in: the learner talks over the reply
+                for pcm in ended:
+                    send(self._binary_event({'type': 'speech_end'}))
+                    utterances.put(pcm)
+        except ConnectionClosed:
+            pass
+        finally:
+            session.cancel_turn()
+            utterances.put(None)
+
+    def _run_voice_turn(self, session, vad, pcm, send):
+        """Transcribe one utterance from the voice socket and stream the reply back over it."""
+        trace = LatencyTrace("voice")  # starts at the end of the utterance
+        turn = session.start_turn()
+        if not self.turn_slots.acquire(timeout=self.turn_wait_seconds):
+            send(self._binary_event({'type': 'error', 'error': 'Server busy, try again'}))
+            return
+        try:
+            user_message, stt_ms = self._process_audio_input(session, vad.to_wav(pcm))
+            trace.add("stt", stt_ms)
+            if turn.cancelled:
+                return
+            if not user_message or not user_message.strip():
+                send(self._binary_event({'type': 'error', 'error': 'Could not transcribe audio'}))
+                return
+
+            pipeline = self._start_ai_response_stream(session, user_message, turn)
+            input_duration_sec = len(pcm) / (2 * vad.sample_rate)
+            for frame in self._generate_streaming_response(user_message, pipeline, trace, input_duration_sec, binary=True):
+                send(frame)
+        finally:
+            turn.cancel()  # a failed send leaves the generator unfinished, stop the work behind it
+            self.turn_slots.release()
+
+    def _get_session(self):
+        """Return the current learner's session, starting a new one if the cookie is missing or stale."""
+        session_id = request.cookies.get(self.SESSION_COOKIE)
+        # only IDs this server handed out are accepted, from memory or the session store
+        session = self.conversation.sessions.resume(session_id) if session_id else None
+        if session is None:
+            session_id = self.conversation.sessions.new_session_id()
+            g.new_session_id = session_id
+            session = self.conversation.get_session(session_id)
+        return session
+
+    def _process_audio_input(self, session, audio_bytes):
         """Transcribe audio and return user message with timing."""
         start_time = time.time()
-        user_message = self.conversation.stt.transcribe_audio(temp_file_path)
+        stt = self.conversation.stt
+        with session.lock:
+            speculative_turns = session.stt_speculative_turns
+        user_message, fell_back = stt.transcribe_audio_detailed(audio_bytes, speculative_turns=speculative_turns)
+        if user_message is not None:
+            with session.lock:
+                session.stt_speculative_turns = stt.speculative_turns_after(session.stt_speculative_turns, fell_back)
         stt_ms = (time.time() - start_time) * 1000
         return user_message, stt_ms
     
-    def _generate_ai_response(self, user_message):
-        """Generate AI response and return response with timing."""
-        if not user_message.strip():
-            raise ValueError("Empty message")
-        
-        formatted_prompt = self.conversation.memory.build_prompt(user_message)
-        
-        start_time = time.time()
-        response = self.conversation.llm.ask(formatted_prompt)
-        llm_ms = (time.time() - start_time) * 1000
-        
-        self.conversation.memory.add_exchange(user_message, response)
-        return response, llm_ms
-    
     def _translate(self, response):
         """Translates the ai's response to english."""
         start_time = time.time()
@@ -130,55 +336,151 @@ class WebApp:
         print(f"Translation: {translation}")
         return translation, translate_ms
     
-    def _generate_streaming_response(self, user_message, response):
-        """Generate streaming SSE response with audio chunks."""
-        # Send initial data WITHOUT translation
-        yield f"data: {json.dumps({'type': 'text', 'user_message': user_message, 'response': response})}\n\n"
-        
+    def _start_ai_response_stream(self, session, user_message, turn=None):
+        """Start the token-streaming LLM call and return a pipeline yielding its sentences."""
+        if not user_message.strip():
+            raise ValueError("Empty message")
+
+        with session.lock:
+            messages = session.memory.build_messages(user_message)
+
+        def on_complete(response):
+            self.conversation.remember_exchange(session, user_message, response)
+            # translate as soon as the full response is known, it runs alongside the remaining TTS
+            return WorkerPool.submit(self._translate, response)
+
+        token_stream = self.conversation.llm.ask_messages_stream(messages, turn=turn)
+        return SentencePipeline(token_stream, on_complete=on_complete, turn=turn, keep_short=self.conversation.tts.keep_sentence_alone).start()
+
+    def _generate_streaming_response(self, user_message, pipeline, trace, input_duration_sec=0, binary=False):
+        """Generate streaming response (SSE or binary frames), synthesizing each sentence while the LLM keeps generating."""
+        frames = self._stream_frames(user_message, pipeline, trace, binary)
         try:
-            # Stream real-time audio chunks
-            for audio_chunk in self.conversation.tts.synthesize_speech_streaming(response):
-                yield f"data: {json.dumps({'type': 'audio_chunk', 'chunk': audio_chunk})}\n\n"
-        except AttributeError:
-            # Fallback if streaming not available
-            audio_base64 = self.conversation.tts.synthesize_speech(response)
-            yield f"data: {json.dumps({'type': 'audio_chunk', 'chunk': audio_base64})}\n\n"
-        
+            while True:
+                try:
+                    frame = next(frames)
+                except StopIteration as stop:
+                    output_bytes = stop.value
+                    break
+                # time spent suspended here is the server writing the frame to the client
+                flush_start = time.perf_counter()
+                yield frame
+                trace.add("flush", (time.perf_counter() - flush_start) * 1000)
+        except GeneratorExit:
+            # client went away mid-stream, the response's close cancels the turn
+            self.metrics.increment(f"{trace.kind}.disconnected")
+            raise
+        finally:
+            frames.close()
+
+        trace.mark("total")
+        if output_bytes is None:
+            self.metrics.increment(f"{trace.kind}.{'cancelled' if pipeline.cancelled else 'errors'}")
+            return
+        self._log_performance_metrics(trace, input_duration_sec=input_duration_sec, output_duration_sec=output_bytes / self.OUTPUT_BYTES_PER_SEC)
+
+    def _stream_frames(self, user_message, pipeline, trace, binary=False):
+        """Frames of one streamed turn, returns the number of PCM bytes sent (None if cancelled or failed)."""
+        event = self._binary_event if binary else self._sse_event
+        audio = self._binary_audio if binary else self._sse_audio
+        synthesize = self.conversation.tts.synthesize_speech_streaming_pcm if binary else self.conversation.tts.synthesize_speech_streaming
+
+        # Send initial data, the response text follows sentence by sentence
+        yield event({'type': 'text', 'user_message': user_message, 'response': ''})
+
+        output_bytes = 0
+        translation_sent = False
+        for sentence in pipeline:
+            yield event({'type': 'text_chunk', 'text': sentence})
+            # Stream real-time audio chunks, timing only the synthesis (not our own yields)
+            chunks = iter(synthesize(sentence, turn=pipeline.turn))
+            while True:
+                tts_start = time.perf_counter()
+                audio_chunk = next(chunks, None)
+                tts_ms = (time.perf_counter() - tts_start) * 1000
+                trace.add("tts", tts_ms)
+                if audio_chunk is None:
+                    break
+                if "tts_first_chunk" not in trace.spans:
+                    trace.add("tts_first_chunk", tts_ms)
+                    trace.mark("first_audio")
+                # base64 (SSE) carries 3 bytes of PCM per 4 characters
+                output_bytes += len(audio_chunk) if binary else len(audio_chunk) * 3 // 4
+                yield from audio(audio_chunk)
+                if not translation_sent and pipeline.completion and pipeline.completion.done():
+                    translation_sent = True
+                    yield self._translation_event(pipeline.completion, event)
+            if pipeline.cancelled:
+                break
+
+        if pipeline.cancelled:
+            # a newer turn took over (barge-in), remaining sentences are dropped
+            yield event({'type': 'cancelled'})
+            return None
+
         # Signal audio end
-        yield f"data: {json.dumps({'type': 'audio_end'})}\n\n"
+        yield event({'type': 'audio_end'})
+
+        if pipeline.error:
+            yield event({'type': 'error', 'error': 'Error generating response'})
+            return None
+
+        # Send translation now if it wasn't ready during the audio
+        if not translation_sent:
+            yield self._translation_event(pipeline.completion, event)
+        translation, translate_ms = pipeline.completion.result()
+        trace.add("llm_first_token", pipeline.first_token_ms)
+        trace.add("llm", pipeline.llm_ms)
+        trace.add("translation", translate_ms)
 
-        # Translate response
-        translation, translate_ms = self._translate(response)
-        print(f"Translation: {translation}")
-        
-        # Send translation as final step
-        yield f"data: {json.dumps({'type': 'translation', 'text': translation})}\n\n"
-        
         # Signal complete
-        yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+        yield event({'type': 'complete'})
+        return output_bytes
+
+    def _translation_event(self, translation_future, event):
+        """Event for a finished (or soon to finish) background translation."""
+        translation, translate_ms = translation_future.result()
+        return event({'type': 'translation', 'text': translation})
+
+    def _sse_event(self, payload):
+        return f"data: {json.dumps(payload)}\n\n"
+
+    def _sse_audio(self, audio_base64):
+        yield self._sse_event({'type': 'audio_chunk', 'chunk': audio_base64})
+
+    def _binary_event(self, payload):
+        data = json.dumps(payload).encode('utf-8')
+        return struct.pack('>BI', self.FRAME_EVENT, len(data)) + data
+
+    def _binary_audio(self, pcm):
+        # header and payload go out as separate writes so provider buffers are passed through as-is,
+        # only memoryview slices of cached audio need turning into bytes for WSGI
+        yield struct.pack('>BI', self.FRAME_AUDIO, len(pcm))
+        yield pcm if isinstance(pcm, bytes) else bytes(pcm)
     
-    def _cleanup_temp_file(self, temp_file_path):
-        """Clean up temporary file safely."""
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception as e:
-                print(f"Warning: Could not delete temp file {temp_file_path}: {e}")
+    def _log_performance_metrics(self, trace, input_duration_sec=0, output_duration_sec=0):
+        """Record a finished turn's spans in the histograms and the latency log."""
+        self.metrics.record_trace(trace)
+        if self.latency_log:
+            self.latency_log.write(trace.as_row(input_duration_sec=round(input_duration_sec, 1), output_duration_sec=round(output_duration_sec, 1)))
 
-    def _log_performance_metrics(self, input_duration_sec=0, output_duration_sec=0, stt_ms=0, llm_ms=0, translation_ms=0, response_time=0):
-        """Log performance metrics for debugging."""
-        tts_ms = 100.0  # estimate for now
-        response_ms = ((time.time() - response_time) * 1000) + tts_ms
-        
         print(
             f"Input duration: {input_duration_sec:.1f}s | "
             f"Output duration: {output_duration_sec:.1f}s | "
-            f"Speech-to-Text took {stt_ms:.1f}ms | "
-            f"LLM took {llm_ms:.1f}ms | "
-            f"Translation took {translation_ms:.1f}ms | "
-            f"Text-to-Speech took {tts_ms:.1f}ms | "
-            f"Response took {response_ms:.1f}ms"
+            + " | ".join(f"{name}: {ms:.1f}ms" for name, ms in trace.timings().items())
         )
 
     def run(self, debug=True):
-        self.app.run(debug=debug)
\ No newline at end of file
+        # each request gets its own thread, session state is guarded per learner
+        self.app.run(debug=debug, threaded=True)
+
+    def serve(self, host='127.0.0.1', port=5000, threads=32):
+        """Serve with a fixed-size worker thread pool (waitress) instead of the dev server."""
+        try:
+            from waitress import serve
+        except ImportError:
+            print("waitress not installed, falling back to the threaded dev server")
+            self.app.run(host=host, port=port, debug=False, threaded=True)
+            return
+        # send_bytes=1 flushes every SSE event immediately instead of buffering
+        serve(self.app, host=host, port=port, threads=threads, send_bytes=1)
\ No newline at end of file
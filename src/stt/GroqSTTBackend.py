@@ -0,0 +1,27 @@
+from groq import Groq
+from src.stt.STTBackend import STTBackend, Transcription
+
+class GroqSTTBackend(STTBackend):
+    """Groq's hosted Whisper API."""
+
+    def __init__(self, api_key: str = None, model_name: str = "whisper-large-v3-turbo", timeout_s: float = 30.0, client=None):
+        if client is None:
+            if not api_key:
+                raise ValueError("Groq API key is required. Set GROQ_API_KEY in .env or pass as argument.")
+            client = Groq(api_key=api_key, timeout=timeout_s, max_retries=0)  # STTManager's policy retries
+        self.client = client  # a groq.Groq, or a stand-in with the same interface (benchmarks)
+        self.model_name = model_name
+
+    def transcribe(self, audio_bytes, filename, language=None):
+        options = {"language": language} if language else {}
+        result = self.client.audio.transcriptions.create(
+            file=(filename, audio_bytes),
+            model=self.model_name,
+            response_format="verbose_json",
+            **options,
+        )
+        return Transcription(result.text, result.language)
+
+    def warm_up(self):
+        """Cheap request that opens the HTTPS connection ahead of the first transcription"""
+        self.client.models.list()
@@ -0,0 +1,94 @@
+import io
+import numpy as np
+from src.core.MicroBatcher import MicroBatcher
+from src.stt.STTBackend import STTBackend, Transcription
+
+class LocalWhisperBackend(STTBackend):
+    """
+    Whisper on the local CPU through faster-whisper (CTranslate2, int8 by default).
+    The model is loaded once and shared; utterances arriving from several sessions at
+    the same time are encoded and decoded as one batch. Needs `pip install faster-whisper`.
+    """
+
+    LANGUAGE_NAMES = {"es": "Spanish", "en": "English"}
+    constrained_language_detection = True
+
+    def __init__(self, model_size: str = "small", device: str = "cpu", compute_type: str = "int8", cpu_threads: int = 0,
+                 languages=("es", "en"), beam_size: int = 1, batch_size: int = 8, batch_window_ms: int = 25):
+        try:
+            from faster_whisper import WhisperModel
+            from faster_whisper.audio import decode_audio, pad_or_trim
+            from faster_whisper.tokenizer import Tokenizer
+        except ImportError:
+            raise ImportError("Local STT needs faster-whisper: pip install faster-whisper")
+        self.decode_audio = decode_audio
+        self.pad_or_trim = pad_or_trim
+        self.Tokenizer = Tokenizer
+
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+        self.languages = tuple(languages)  # auto-detect only picks among these, no misdetection fallback needed
+        self.beam_size = beam_size
+        self.tokenizers = {}  # language code -> Tokenizer, built once
+        self.batcher = MicroBatcher(self._transcribe_batch, max_batch_size=batch_size, max_wait_ms=batch_window_ms, name="local-stt")
+
+    def transcribe(self, audio_bytes, filename, language=None):
+        # decoding and feature extraction run on the caller's thread, only the model call is batched
+        audio = self.decode_audio(io.BytesIO(bytes(audio_bytes)), sampling_rate=self.model.feature_extractor.sampling_rate)
+        if len(audio) > self.model.feature_extractor.n_samples:
+            return self._transcribe_long(audio, language)  # over 30s needs the sliding window, not worth batching
+
+        features = self.pad_or_trim(self.model.feature_extractor(audio), self.model.feature_extractor.nb_max_frames)
+        return self.batcher.submit((features, language)).result()
+
+    def _transcribe_batch(self, items):
+        """One encoder pass and one decoder pass for every queued utterance (each up to 30s)"""
+        features = np.stack([item_features for item_features, _ in items]).astype(np.float32)
+        encoder_output = self.model.encode(features)
+
+        languages = [language for _, language in items]
+        if any(language is None for language in languages):
+            detected = self.model.model.detect_language(encoder_output)
+            languages = [language or self._best_language(probs) for language, probs in zip(languages, detected)]
+
+        tokenizers = [self._tokenizer(language) for language in languages]
+        prompts = [self.model.get_prompt(tokenizer, [], without_timestamps=True) for tokenizer in tokenizers]
+        results = self.model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=self.beam_size,
+            max_length=self.model.max_length,
+            suppress_blank=True,
+            suppress_tokens=[-1],
+        )
+
+        transcriptions = []
+        for result, tokenizer, language in zip(results, tokenizers, languages):
+            tokens = [token for token in result.sequences_ids[0] if token < tokenizer.eot]
+            transcriptions.append(Transcription(tokenizer.decode(tokens).strip(), self.LANGUAGE_NAMES.get(language, language)))
+        return transcriptions
+
+    def _transcribe_long(self, audio, language):
+        segments, info = self.model.transcribe(audio, language=language, beam_size=self.beam_size, without_timestamps=True)
+        text = " ".join(segment.text.strip() for segment in segments)
+        return Transcription(text, self.LANGUAGE_NAMES.get(info.language, info.language))
+
+    def _best_language(self, probs):
+        """Most likely of the accepted languages, from detect_language's [("<|es|>", p), ...]"""
+        allowed = [(token[2:-2], prob) for token, prob in probs if token[2:-2] in self.languages]
+        return max(allowed, key=lambda pair: pair[1])[0] if allowed else self.languages[0]
+
+    def _tokenizer(self, language):
+        tokenizer = self.tokenizers.get(language)
+        if tokenizer is None:
+            tokenizer = self.Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual, task="transcribe", language=language)
+            self.tokenizers[language] = tokenizer
+        return tokenizer
+
+    def warm_up(self):
+        """Run one second of silence through the model so the first learner doesn't pay for lazy init"""
+        silence = np.zeros(self.model.feature_extractor.sampling_rate, dtype=np.float32)
+        features = self.pad_or_trim(self.model.feature_extractor(silence), self.model.feature_extractor.nb_max_frames)
+        self.batcher.submit((features, self.languages[0])).result()
+
+    def stats(self):
+        return self.batcher.stats()
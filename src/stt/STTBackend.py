@@ -0,0 +1,23 @@
+from collections import namedtuple
+
+# language is the full English name ("Spanish"), like Groq's verbose_json response
+Transcription = namedtuple("Transcription", ["text", "language"])
+
+class STTBackend:
+    """Speech-to-text engine behind STTManager, which keeps the language strategy and stats on top."""
+
+    # True if auto-detection only ever picks one of the accepted languages, so a
+    # speculative second "es" pass can never pay off and STTManager skips it
+    constrained_language_detection = False
+
+    def transcribe(self, audio_bytes, filename, language=None):
+        """Transcribe in-memory audio (language is an ISO code, None to auto-detect), returns a Transcription"""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Optional, get the first real transcription off the cold path"""
+        pass
+
+    def stats(self):
+        """Optional backend counters for /metrics (e.g. micro-batching), None if there are none"""
+        return None
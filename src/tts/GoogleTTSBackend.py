@@ -0,0 +1,90 @@
+import base64
+from google.cloud import texttospeech
+from src.tts.TTSBackend import TTSBackend
+
+class GoogleTTSBackend(TTSBackend):
+    """Google Cloud Text-to-Speech: gRPC streaming, plus the REST API for whole WAV files (TTSManager's fallback)."""
+
+    def __init__(self, clients, language_code: str = "es-US", voice_name: str = "es-US-Chirp3-HD-Achernar", timeout_s: float = 30.0):
+        self.timeout_s = timeout_s  # per request, a stuck call must not hold a worker forever
+        # shared credentials (refreshed in the background), pooled HTTP session and gRPC channel
+        self.clients = clients
+        self.url = "https://texttospeech.googleapis.com/v1/text:synthesize"
+        self.grpc_client = self.clients.tts_client()
+        self.voice = texttospeech.VoiceSelectionParams(
+            language_code=language_code,
+            name=voice_name
+        )
+        self.streaming_config = texttospeech.StreamingSynthesizeConfig( # Create streaming config
+            voice=self.voice
+        )
+
+    @property
+    def voice_name(self):
+        return self.voice.name
+
+    def warm_up(self):
+        """Opens the gRPC channel (the first streaming call otherwise pays for connecting)"""
+        self.grpc_client.list_voices(language_code=self.voice.language_code)
+
+    def synthesize_wav(self, text):
+        body = {
+            "input": {
+                "markup": text
+            },
+            "voice": {
+                "languageCode": self.voice.language_code,
+                "name": self.voice.name,
+                "voiceClone": {}
+            },
+            "audioConfig": {
+                "audioEncoding": "LINEAR16"
+            }
+        }
+
+        response = self.clients.session.post(self.url, headers=self._headers(), json=body, timeout=self.timeout_s)
+        if response.status_code == 401:
+            # token revoked or expired early, refresh once and retry
+            self.clients.refresh()
+            response = self.clients.session.post(self.url, headers=self._headers(), json=body, timeout=self.timeout_s)
+        response.raise_for_status()
+        audio_base64 = response.json().get("audioContent")
+        return base64.b64decode(audio_base64) if audio_base64 else None
+
+    def _headers(self):
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.clients.access_token()}",
+        }
+
+    def stream_pcm(self, text, turn=None):
+        """Raw PCM chunks from the gRPC stream as they arrive, no re-encoding. Cancelling `turn` aborts the stream."""
+        def request_generator(): # Create requests iterator
+            # first request with config
+            yield texttospeech.StreamingSynthesizeRequest(
+                streaming_config=self.streaming_config
+            )
+            # second request with input
+            yield texttospeech.StreamingSynthesizeRequest(
+                input=texttospeech.StreamingSynthesisInput(text=text)
+            )
+
+        streaming_response = self.grpc_client.streaming_synthesize(request_generator(), timeout=self.timeout_s)
+        if turn:
+            turn.on_cancel(streaming_response.cancel)
+
+        try:
+            chunk_count = 0
+            for response in streaming_response: # yield audio chunks as they arrive
+                if turn and turn.cancelled:
+                    return
+                if response.audio_content:
+                    chunk_count += 1
+                    print(f"Streaming TTS: Got chunk {chunk_count}, size: {len(response.audio_content)} bytes")
+                    yield response.audio_content
+
+            print(f"Streaming TTS completed with {chunk_count} chunks")
+        except Exception:
+            if turn and turn.cancelled:
+                return  # the stream was cancelled on purpose
+            raise
@@ -0,0 +1,41 @@
+import os
+import numpy as np
+from src.tts.TTSBackend import TTSBackend
+
+class LocalTTSBackend(TTSBackend):
+    """
+    Piper (ONNX) voice on the local CPU, no network or per-character cost.
+    Needs `pip install piper-tts` and a voice model, e.g. es_MX-ald-medium.onnx with its .onnx.json.
+    """
+
+    def __init__(self, model_path: str, config_path: str = None, voice_name: str = None, use_cuda: bool = False):
+        try:
+            from piper import PiperVoice
+        except ImportError:
+            raise ImportError("Local TTS needs piper-tts: pip install piper-tts")
+        self.voice = PiperVoice.load(model_path, config_path=config_path, use_cuda=use_cuda)
+        self._voice_name = voice_name or f"piper-{os.path.splitext(os.path.basename(model_path))[0]}"
+
+    @property
+    def voice_name(self):
+        return self._voice_name
+
+    def warm_up(self):
+        """First ONNX run allocates the session buffers"""
+        for _ in self.stream_pcm("Hola."):
+            pass
+
+    def stream_pcm(self, text, turn=None):
+        # piper yields one chunk per sentence, at the voice's own rate (usually 22.05kHz)
+        for chunk in self.voice.synthesize(text):
+            if turn and turn.cancelled:
+                return
+            yield self._resample(chunk.audio_float_array, chunk.sample_rate)
+
+    def _resample(self, samples, sample_rate):
+        """Float samples in [-1, 1] to 24kHz 16-bit PCM, linear interpolation is plenty for speech"""
+        if sample_rate != self.SAMPLE_RATE:
+            target_length = int(len(samples) * self.SAMPLE_RATE / sample_rate)
+            positions = np.linspace(0, len(samples) - 1, num=target_length)
+            samples = np.interp(positions, np.arange(len(samples)), samples)
+        return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
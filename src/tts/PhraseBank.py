@@ -0,0 +1,94 @@
+import json
+import mmap
+import os
+import threading
+from src.tts.TTSBackend import TTSBackend
+
+class PhraseBank:
+    """
+    Pre-synthesized audio for fixed phrases (scenario openers, stock replies), built offline by
+    build_phrase_bank.py. All phrases of one voice are concatenated 24kHz 16-bit PCM in
+    `<voice>.pcm`, memory-mapped at startup, with a `<voice>.json` index of byte ranges.
+    A hit is a zero-copy memoryview slice, no TTS call at all.
+    """
+
+    def __init__(self, directory, voice_name):
+        self.pcm_path = os.path.join(directory, f"{voice_name}.pcm")
+        index_path = os.path.join(directory, f"{voice_name}.json")
+        with open(index_path, "r", encoding="utf-8") as f:
+            self.index = json.load(f)["phrases"]  # normalized text -> [offset, length]
+        with open(self.pcm_path, "rb") as f:
+            self.audio = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # the mapping stays valid after close
+        self.view = memoryview(self.audio)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, directory, voice_name):
+        """The bank for this voice, or None if it hasn't been built"""
+        try:
+            bank = cls(directory, voice_name)
+        except (OSError, ValueError) as e:
+            print(f"No phrase bank for {voice_name} in {directory}: {e}")
+            return None
+        print(f"Phrase bank loaded: {len(bank.index)} phrases for {voice_name}")
+        return bank
+
+    @staticmethod
+    def normalize(text):
+        # case and spacing don't change the audio, punctuation does (¡Hola! vs Hola.)
+        return " ".join(text.split()).casefold()
+
+    def __contains__(self, text):
+        return self.normalize(text) in self.index  # not counted as a hit or miss
+
+    def get(self, text):
+        """PCM for this exact phrase as a memoryview, or None"""
+        entry = self.index.get(self.normalize(text))
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        offset, length = entry
+        return self.view[offset:offset + length]
+
+    def stats(self):
+        with self.lock:
+            return {"phrases": len(self.index), "hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def phrases_from_config(config):
+        """Shared phrases plus every roleplay scenario's phrases, deduplicated in order"""
+        phrases = list(config.get("phrase_bank_common", []))
+        for scenario in config.get("roleplay_scenarios", {}).values():
+            phrases.extend(scenario.get("phrases", []))
+        return list(dict.fromkeys(phrases))
+
+    @classmethod
+    def build(cls, directory, voice_name, phrases, synthesize_pcm):
+        """Synthesize every phrase with `synthesize_pcm(text) -> bytes` and write the bank files, returns the phrase count"""
+        os.makedirs(directory, exist_ok=True)
+        pcm_path = os.path.join(directory, f"{voice_name}.pcm")
+        index_path = os.path.join(directory, f"{voice_name}.json")
+        index = {}
+        offset = 0
+        # write to temp files and swap them in, a running server keeps its old mapping
+        with open(pcm_path + ".tmp", "wb") as f:
+            for text in phrases:
+                key = cls.normalize(text)
+                if key in index:
+                    continue
+                pcm = synthesize_pcm(text)
+                if not pcm:
+                    print(f"Skipping phrase with no audio: {text}")
+                    continue
+                f.write(pcm)
+                index[key] = [offset, len(pcm)]
+                offset += len(pcm)
+        with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"voice": voice_name, "sample_rate": TTSBackend.SAMPLE_RATE, "phrases": index}, f, ensure_ascii=False, indent=1)
+        os.replace(pcm_path + ".tmp", pcm_path)
+        os.replace(index_path + ".tmp", index_path)
+        return len(index)
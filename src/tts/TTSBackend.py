@@ -0,0 +1,40 @@
+import io
+import wave
+
+class TTSBackend:
+    """Text-to-speech engine behind TTSManager, which keeps the caches and phrase bank in front of it."""
+
+    SAMPLE_RATE = 24000  # every backend produces 24kHz 16-bit mono PCM, what the browser player expects
+
+    @property
+    def voice_name(self):
+        """Identifies the voice in cache keys and phrase bank files, audio from different voices never mixes"""
+        raise NotImplementedError
+
+    def stream_pcm(self, text, turn=None):
+        """Generator of PCM chunks as they are synthesized, stops early once `turn` is cancelled"""
+        raise NotImplementedError
+
+    def synthesize_wav(self, text):
+        """Whole utterance as WAV file bytes"""
+        return self.pcm_to_wav(b"".join(self.stream_pcm(text)))
+
+    def warm_up(self):
+        """Optional, get the first real synthesis off the cold path"""
+        pass
+
+    @classmethod
+    def pcm_to_wav(cls, pcm):
+        output = io.BytesIO()
+        with wave.open(output, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(cls.SAMPLE_RATE)
+            wav_file.writeframes(pcm)
+        return output.getvalue()
+
+    @staticmethod
+    def wav_to_pcm(wav_bytes):
+        """Raw PCM frames of a WAV file"""
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+            return wav_file.readframes(wav_file.getnframes())
@@ -1,25 +1,99 @@
 from src.flask.WebApp import WebApp
-from src.LLMManager import LLMManager
-from src.STTManager import STTManager
-from src.TTSManager import TTSManager
 from src.core.ConversationService import ConversationService
-from src.Translator import Translator
+from src.core.WorkerPool import WorkerPool
+from src.core.ServiceReadiness import ServiceReadiness
+from src.core.MetricsRegistry import MetricsRegistry
+from src.core.ResilientCaller import ResilientCaller
 from src.Utils import Utils
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
 
+# The backends are imported inside their builders so the Groq / Google SDK imports
+# (the bulk of startup time) run in parallel, and the server can start accepting
+# connections while they load. Requests that need a backend wait for it.
+
+# Each provider gets its call policy (deadline, retries, hedging, circuit breaker) from
+# config["resilience"][name]; local models use their own section, hedging them only doubles CPU work.
+# `groq_client` replaces the Groq SDK client (the benchmark passes a fake one), None builds the real one.
+
+def build_stt(config, metrics, groq_client=None):
+    from src.STTManager import STTManager
+    backend = None
+    fallback_backend = None
+    if config.get("stt_backend", "groq") == "local":
+        from src.stt.LocalWhisperBackend import LocalWhisperBackend
+        backend = LocalWhisperBackend(**config.get("stt_local", {}))
+        policy = ResilientCaller.from_config("stt_local", config, metrics)
+    else:
+        policy = ResilientCaller.from_config("stt", config, metrics)
+        if config.get("stt_fallback_model_name"):
+            from src.stt.GroqSTTBackend import GroqSTTBackend
+            fallback_backend = GroqSTTBackend(api_key=os.environ.get("GROQ_API_KEY"), model_name=config["stt_fallback_model_name"], timeout_s=policy.timeout_s, client=groq_client)
+        if groq_client is not None:
+            from src.stt.GroqSTTBackend import GroqSTTBackend
+            backend = GroqSTTBackend(model_name=config.get("stt_model_name", "whisper-large-v3-turbo"), client=groq_client)
+    return STTManager(api_key=os.environ.get("GROQ_API_KEY"), model_name=config.get("stt_model_name", "whisper-large-v3-turbo"), downsample=config.get("stt_downsample", False), language_strategy=config.get("stt_language_strategy", "fallback"), session_speculative_turns=config.get("stt_session_speculative_turns", 5), backend=backend, fallback_backend=fallback_backend, policy=policy)
+
+def build_llm(config, metrics, groq_client=None):
+    from src.LLMManager import LLMManager
+    return LLMManager(model_name=config["llm_model_name"], api_key=os.environ.get("GROQ_API_KEY"), fallback_model_name=config.get("llm_fallback_model_name"), policy=ResilientCaller.from_config("llm", config, metrics), client=groq_client)
+
+def build_google_clients(config):
+    from src.core.GoogleClients import GoogleClients
+    # one credentials object / connection pool for TTS and Translate
+    return GoogleClients(config.get("google_credentials_path", "google_credentials.json"))
+
+def build_tts(config, google_clients, metrics):
+    from src.TTSManager import TTSManager
+    backend = None
+    policy_name = "tts"
+    if config.get("tts_backend", "google") == "local":
+        from src.tts.LocalTTSBackend import LocalTTSBackend
+        backend = LocalTTSBackend(**config.get("tts_local", {}))
+        policy_name = "tts_local"
+    return TTSManager(
+        google_credentials_path=config.get("google_credentials_path", "google_credentials.json"),
+        cache_dir=config.get("tts_cache_dir"),
+        cache_max_bytes=config.get("tts_cache_max_mb", 200) * 1024 * 1024,
+        clients=google_clients.result() if backend is None else None,
+        backend=backend,
+        phrase_bank_dir=config.get("tts_phrase_bank_dir"),
+        policy=ResilientCaller.from_config(policy_name, config, metrics)
+    )
+
+def build_translator(config, google_clients, metrics):
+    from src.Translator import Translator
+    return Translator(google_credentials_path=config.get("google_credentials_path", "google_credentials.json"), cache_path=config.get("translation_cache_path"), clients=google_clients.result(), policy=ResilientCaller.from_config("translate", config, metrics))
+
 def main():
     load_dotenv()
     config = Utils.load_config()
-    stt = STTManager(api_key=os.environ.get("GROQ_API_KEY"), model_name=config.get("stt_model_name", "whisper-large-v3-turbo"))
-    llm = LLMManager(model_name=config["llm_model_name"], api_key=os.environ.get("GROQ_API_KEY"))
-    tts = TTSManager(google_credentials_path=config.get("google_credentials_path", "google_credentials.json"))
-    translator = Translator(google_credentials_path=config.get("google_credentials_path", "google_credentials.json"))
+    WorkerPool.configure(config.get("io_workers", 32))
+    ResilientCaller.configure(config.get("provider_workers", 64))
+    metrics = MetricsRegistry()  # shared by the provider policies and the per-turn spans, served on /metrics
+
+    init_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="init")
+    readiness = ServiceReadiness(init_executor)
+    warm_up = (lambda backend: backend.warm_up()) if config.get("warm_up", False) else None
+    google_clients = readiness.start("google_auth", lambda: build_google_clients(config))
+    stt = readiness.start("stt", lambda: build_stt(config, metrics), warm_up)
+    llm = readiness.start("llm", lambda: build_llm(config, metrics), warm_up)
+    tts = readiness.start("tts", lambda: build_tts(config, google_clients, metrics), warm_up)
+    translator = readiness.start("translator", lambda: build_translator(config, google_clients, metrics), warm_up)
+    init_executor.shutdown(wait=False)  # no more work to submit, threads exit once the builds finish
+
     conversation = ConversationService(llm=llm, stt=stt, tts=tts, translator=translator, config=config, selected_scenario="coffee_shop")
 
-    web_app = WebApp(conversation=conversation)
+    server_mode = config.get("server_mode", "dev")
+    # waitress can't hand a connection over to a WebSocket, the voice socket needs werkzeug ("dev" / "threaded")
+    voice_socket = server_mode != "pool"
+    web_app = WebApp(conversation=conversation, max_concurrent_turns=config.get("max_concurrent_turns", 24), vad_config=config.get("vad"), readiness=readiness, latency_log_path=config.get("latency_log_path"), metrics=metrics, precompressed_static=config.get("static_precompressed", False), voice_socket=voice_socket)
     print("Starting server at http://127.0.0.1:5000")
-    web_app.run()
+    if server_mode == "pool":
+        web_app.serve(threads=config.get("server_threads", 32))
+    else:
+        web_app.run(debug=server_mode == "dev")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()